@@ -5,7 +5,7 @@ from conan.tools.build import build_jobs, cross_building, valid_min_cppstd, supp
 from conan.tools.env import VirtualBuildEnv
 from conan.tools.files import (
     apply_conandata_patches, chdir, collect_libs, copy, export_conandata_patches,
-    get, mkdir, rename, replace_in_file, rm, rmdir, save
+    get, load, mkdir, rename, replace_in_file, rm, rmdir, save
 )
 from conan.tools.gnu import AutotoolsToolchain
 from conan.tools.layout import basic_layout
@@ -13,6 +13,8 @@ from conan.tools.microsoft import is_msvc, is_msvc_static_runtime, MSBuildToolch
 from conan.tools.scm import Version
 
 import glob
+import hashlib
+from contextlib import contextmanager
 from io import StringIO
 import os
 import re
@@ -100,6 +102,9 @@ class BoostConan(ConanFile):
         "debug_level": list(range(0, 14)),
         "pch": [True, False],
         "extra_b2_flags": [None, "ANY"],  # custom b2 flags
+        "lto": [None, "full", "thin", "fat"],  # b2 lto=on with this lto-mode
+        "instruction_set": [None, "ANY"],  # b2 instruction-set, see _b2_instruction_sets
+        "optimization": [None, "speed", "space"],  # b2 optimization, with full inlining for speed
         "i18n_backend": ["iconv", "icu", None, "deprecated"],
         "i18n_backend_iconv": ["libc", "libiconv", "off"],
         "i18n_backend_icu": [True, False],
@@ -139,6 +144,9 @@ class BoostConan(ConanFile):
         "debug_level": 0,
         "pch": True,
         "extra_b2_flags": None,
+        "lto": None,
+        "instruction_set": None,
+        "optimization": None,
         "i18n_backend": "deprecated",
         "i18n_backend_iconv": "libc",
         "i18n_backend_icu": False,
@@ -637,6 +645,9 @@ class BoostConan(ConanFile):
         if self.options.header_only:
             self.options.rm_safe("shared")
             self.options.rm_safe("fPIC")
+            self.options.rm_safe("lto")
+            self.options.rm_safe("instruction_set")
+            self.options.rm_safe("optimization")
         elif self.options.shared:
             self.options.rm_safe("fPIC")
 
@@ -775,10 +786,57 @@ class BoostConan(ConanFile):
             raise ConanInvalidConfiguration("Boost.Cobalt requires a C++20 capable compiler. "
                                             "Please, set compiler.cppstd and use a newer compiler version, or disable from building.")
 
+        self._validate_optimization_options()
+
         # TODO: Revisit on Boost 1.87.0. Remove in case Process is fixed.
         if Version(self.version) == "1.86.0" and is_msvc(self) and self.options.get_safe("shared") and self.options.get_safe("without_process", None) == False:
             raise ConanInvalidConfiguration(f"{self.ref} Boost.Process will fail to be consumed as shared library on MSVC. See https://github.com/boostorg/process/issues/408.")
 
+    @property
+    def _b2_instruction_sets(self):
+        # Subset of the instruction-set values of b2, mapped to -march/-mcpu by its gcc and clang toolsets
+        return {
+            "x86_64": [
+                "native", "core2", "nehalem", "sandy-bridge", "ivy-bridge", "haswell", "broadwell", "skylake",
+                "skylake-avx512", "cascadelake", "icelake-client", "icelake-server", "znver1", "znver2", "znver3",
+            ],
+            "armv8": ["native", "cortex-a53", "cortex-a57", "cortex-a72"],
+        }.get(str(self.settings.arch), [])
+
+    def _validate_optimization_options(self):
+        lto = self.options.get_safe("lto")
+        if lto:
+            if self.settings.compiler not in ["gcc", "clang", "apple-clang", "msvc"]:
+                raise ConanInvalidConfiguration(f"lto is not supported with {self.settings.compiler}")
+            if lto == "thin" and self.settings.compiler not in ["clang", "apple-clang"]:
+                raise ConanInvalidConfiguration("lto=thin requires clang or apple-clang")
+            if lto == "fat" and self.settings.compiler != "gcc":
+                raise ConanInvalidConfiguration("lto=fat requires gcc")
+            if is_msvc(self) and lto != "full":
+                raise ConanInvalidConfiguration("Only lto=full is supported with msvc")
+
+        instruction_set = self.options.get_safe("instruction_set")
+        if instruction_set:
+            if self.settings.compiler not in ["gcc", "clang", "apple-clang"] or self._is_clang_cl:
+                raise ConanInvalidConfiguration(f"instruction_set is not supported with {self.settings.compiler}")
+            if instruction_set not in self._b2_instruction_sets:
+                raise ConanInvalidConfiguration(
+                    f"instruction_set={instruction_set} is not supported for {self.settings.arch}, "
+                    f"possible values: {', '.join(self._b2_instruction_sets) or 'none'}"
+                )
+            if instruction_set == "native" and cross_building(self):
+                raise ConanInvalidConfiguration("instruction_set=native can't be used when cross-building")
+
+    @property
+    def _lto_link_flags(self):
+        # Objects of a static LTO build only contain intermediate code, consumers have to link them with LTO too
+        lto = self.options.get_safe("lto")
+        if not lto or self._shared or lto == "fat":
+            return []
+        if is_msvc(self):
+            return ["/LTCG"]
+        return ["-flto=thin"] if lto == "thin" else ["-flto"]
+
     def _with_dependency(self, dependency):
         """
         Return true when dependency is required according to the dependencies-x.y.z.yml file
@@ -1067,6 +1125,48 @@ class BoostConan(ConanFile):
     def _boost_build_dir(self):
         return os.path.join(self.source_folder, "tools", "build")
 
+    @contextmanager
+    def _b2_build_dir(self):
+        # b2 only rebuilds the targets whose sources or properties changed, so a build dir kept between
+        # package builds of the same configuration only compiles the newly requested libraries.
+        # The key leaves out the selected libraries and the paths specific to this package build.
+        cache_root = self.conf.get("user.boost:build_cache_folder", check_type=str)
+        if not cache_root:
+            yield self.build_folder
+            return
+        ignored_prefixes = ("--with-", "--prefix=", "--user-config=", "-j", "-d")
+        key_flags = [flag for flag in self._build_flags if flag and not flag.startswith(ignored_prefixes)]
+        key_options = [line for line in self.options.dumps().splitlines() if not line.startswith("without_")]
+        user_config = load(self, os.path.join(self._boost_build_dir, "user-config.jam"))
+        key_data = [str(self.version), self.settings.dumps()] + key_options + key_flags + [user_config]
+        key = hashlib.sha256("\n".join(key_data).encode()).hexdigest()[:16]
+        build_dir = os.path.join(cache_root, f"{self.name}-{self.version}", key)
+        mkdir(self, build_dir)
+        # Two b2 runs must not share a build dir: hold an exclusive lock for the whole run and
+        # fall back to this package's own build folder while another build holds it.
+        with open(os.path.join(build_dir, ".conan-lock"), "a") as lock_file:
+            if not self._try_lock(lock_file):
+                self.output.warning(f"b2 build directory {build_dir} is in use, building in {self.build_folder}")
+                yield self.build_folder
+                return
+            self.output.info(f"Using b2 build directory {build_dir}")
+            yield build_dir
+
+    @staticmethod
+    def _try_lock(lock_file):
+        # The lock is released when the file is closed, including when the process dies
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
     def _build_bcp(self):
         folder = os.path.join(self.source_folder, "tools", "bcp")
         with chdir(self, folder):
@@ -1156,15 +1256,16 @@ class BoostConan(ConanFile):
         full_command = f"{self._b2_exe} {b2_flags}"
         # -d2 is to print more debug info and avoid travis timing out without output
         sources = os.path.join(self.source_folder, self._bcp_dir) if self._use_bcp else self.source_folder
-        full_command += f' --debug-configuration --build-dir="{self.build_folder}"'
-        self.output.warning(full_command)
+        with self._b2_build_dir() as build_dir:
+            full_command += f' --debug-configuration --build-dir="{build_dir}"'
+            self.output.warning(full_command)
 
-        # If sending a user-specified toolset to B2, setting the vcvars
-        # interferes with the compiler selection.
-        with chdir(self, sources):
-            # To show the libraries *1
-            # self.run("%s --show-libraries" % b2_exe)
-            self.run(full_command)
+            # If sending a user-specified toolset to B2, setting the vcvars
+            # interferes with the compiler selection.
+            with chdir(self, sources):
+                # To show the libraries *1
+                # self.run("%s --show-libraries" % b2_exe)
+                self.run(full_command)
 
     @property
     def _b2_os(self):
@@ -1449,6 +1550,15 @@ class BoostConan(ConanFile):
         if not self.options.without_python and self.options.python_buildid:
             flags.append(f"--python-buildid={self.options.python_buildid}")
 
+        if self.options.get_safe("lto"):
+            flags.extend(["lto=on", f"lto-mode={self.options.lto}"])
+        if self.options.get_safe("instruction_set"):
+            flags.append(f"instruction-set={self.options.instruction_set}")
+        if self.options.get_safe("optimization") == "speed":
+            flags.extend(["optimization=speed", "inlining=full"])
+        elif self.options.get_safe("optimization") == "space":
+            flags.extend(["optimization=space", "inlining=on"])
+
         if self.options.extra_b2_flags:
             flags.extend(shlex.split(str(self.options.extra_b2_flags)))
 
@@ -2110,6 +2220,9 @@ class BoostConan(ConanFile):
                 (self.settings.compiler == "gcc" and Version(self.settings.compiler.version) == "10"):
                 self.cpp_info.components["cobalt"].cxxflags.append("-fcoroutines")
 
+            self.cpp_info.components["_libboost"].sharedlinkflags.extend(self._lto_link_flags)
+            self.cpp_info.components["_libboost"].exelinkflags.extend(self._lto_link_flags)
+
         #TODO: remove in the future, user_info deprecated in conan2, but kept for compatibility while recipe is cross-compatible.
         self.user_info.stacktrace_addr2line_available = self._stacktrace_addr2line_available
         self.conf_info.define("user.boost:stacktrace_addr2line_available", self._stacktrace_addr2line_available)
@@ -0,0 +1,83 @@
+// Times the polygon operations a slicer runs for every layer: unions of many
+// small islands, intersections with a clip region and offsets of the result.
+//
+// Usage: clipper2-bench [iterations]
+
+#include <clipper2/clipper.h>
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+#include <random>
+
+using namespace Clipper2Lib;
+
+namespace {
+
+Paths64 random_islands(std::mt19937& rng, int count, int vertices, int64_t extent, int64_t radius) {
+    std::uniform_int_distribution<int64_t> center(radius, extent - radius);
+    std::uniform_real_distribution<double> scale(0.5, 1.0);
+    const double pi = 3.14159265358979323846;
+
+    Paths64 islands;
+    islands.reserve(count);
+    for (int i = 0; i < count; ++i) {
+        const int64_t cx = center(rng);
+        const int64_t cy = center(rng);
+        Path64 island;
+        island.reserve(vertices);
+        for (int v = 0; v < vertices; ++v) {
+            const double angle = 2.0 * pi * v / vertices;
+            const double r = radius * scale(rng);
+            island.push_back(Point64(cx + static_cast<int64_t>(r * std::cos(angle)),
+                                     cy + static_cast<int64_t>(r * std::sin(angle))));
+        }
+        islands.push_back(island);
+    }
+    return islands;
+}
+
+void run(const char* name, int iterations, const std::function<size_t()>& operation) {
+    size_t result_size = operation();  // warm-up
+    const auto start = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; ++i) {
+        result_size = operation();
+    }
+    const std::chrono::duration<double, std::milli> elapsed = std::chrono::steady_clock::now() - start;
+    std::printf("%-32s %10.3f ms/op  (%zu paths)\n", name, elapsed.count() / iterations, result_size);
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const int iterations = argc > 1 ? std::max(1, std::atoi(argv[1])) : 20;
+
+    // Coordinates in microns on a 200x200 mm build plate
+    const int64_t extent = 200000;
+    std::mt19937 rng(42);
+    const Paths64 small = random_islands(rng, 200, 32, extent, 5000);
+    const Paths64 large = random_islands(rng, 2000, 64, extent, 3000);
+    const Paths64 clip = {Path64{Point64(10000, 10000), Point64(190000, 10000), Point64(190000, 190000), Point64(10000, 190000)}};
+    const Paths64 merged = Union(large, FillRule::NonZero);
+
+    std::printf("%d iterations\n", iterations);
+    run("union 200 x 32 vertices", iterations, [&]() {
+        return Union(small, FillRule::NonZero).size();
+    });
+    run("union 2000 x 64 vertices", iterations, [&]() {
+        return Union(large, FillRule::NonZero).size();
+    });
+    run("intersect 2000 x 64 vertices", iterations, [&]() {
+        return Intersect(large, clip, FillRule::NonZero).size();
+    });
+    run("offset -400 miter", iterations, [&]() {
+        return InflatePaths(merged, -400.0, JoinType::Miter, EndType::Polygon).size();
+    });
+    run("offset +400 round", iterations, [&]() {
+        return InflatePaths(merged, 400.0, JoinType::Round, EndType::Polygon).size();
+    });
+    return 0;
+}
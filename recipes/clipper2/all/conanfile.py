@@ -1,7 +1,8 @@
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
-from conan.tools.files import get, copy, rmdir, export_conandata_patches, apply_conandata_patches, replace_in_file
-from conan.tools.build import check_min_cppstd
+from conan.tools.files import get, copy, rmdir, export_conandata_patches, apply_conandata_patches, replace_in_file, save
+from conan.tools.build import check_min_cppstd, cross_building
+from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 import os
@@ -23,6 +24,10 @@ class Clipper2Conan(ConanFile):
         "usingz": ["ON", "OFF", "ONLY"],
         "with_max_precision": ["ANY"],
         "with_hi_precision": [True, False],
+        "with_benchmarks": [True, False],
+        "enable_lto": [True, False],
+        "cpu_profile": [None, "x86-64-v2", "x86-64-v3", "x86-64-v4", "armv8.2-a", "native"],
+        "fp_contract": [None, "off", "on", "fast"],
     }
     default_options = {
         "shared": False,
@@ -30,6 +35,17 @@ class Clipper2Conan(ConanFile):
         "usingz": "ON",
         "with_max_precision": 8,
         "with_hi_precision": False,
+        "with_benchmarks": False,
+        "enable_lto": False,
+        "cpu_profile": None,
+        "fp_contract": None,
+    }
+    options_description = {
+        "with_benchmarks": "Build and package clipper2-bench, timing unions, intersections and offsets of random polygons",
+        "enable_lto": "Build with link-time optimization",
+        "cpu_profile": "Target instruction set passed as -march (or /arch with MSVC)",
+        "fp_contract": "Floating-point contraction mode passed as -ffp-contract. "
+                       "Contracting into FMA can change the rounding of intersection points",
     }
 
     @property
@@ -46,8 +62,40 @@ class Clipper2Conan(ConanFile):
             "msvc": "192",
         }
 
+    @property
+    def _cpu_profile_archs(self):
+        return {
+            "x86-64-v2": ["x86_64"],
+            "x86-64-v3": ["x86_64"],
+            "x86-64-v4": ["x86_64"],
+            "armv8.2-a": ["armv8", "armv8.3"],
+            "native": None,
+        }
+
+    @property
+    def _cpu_profile_compilers_minimum_version(self):
+        # -march=x86-64-v2/v3/v4
+        return {
+            "gcc": "11",
+            "clang": "12",
+            "apple-clang": "13",
+        }
+
+    @property
+    def _cpu_profile_flags(self):
+        profile = str(self.options.cpu_profile)
+        if is_msvc(self):
+            # x86-64-v2 is the MSVC baseline already
+            return {
+                "x86-64-v2": [],
+                "x86-64-v3": ["/arch:AVX2"],
+                "x86-64-v4": ["/arch:AVX512"],
+            }[profile]
+        return [f"-march={profile}"]
+
     def export_sources(self):
         export_conandata_patches(self)
+        copy(self, "*", os.path.join(self.recipe_folder, "benchmark"), os.path.join(self.export_sources_folder, "src", "conan_benchmark"))
 
     def config_options(self):
         if self.settings.os == "Windows":
@@ -72,6 +120,23 @@ class Clipper2Conan(ConanFile):
             raise ConanInvalidConfiguration(
                 f"{self.ref} requires C++{self._min_cppstd}, which your compiler does not support."
             )
+        if self.options.cpu_profile:
+            profile = str(self.options.cpu_profile)
+            archs = self._cpu_profile_archs[profile]
+            if archs and self.settings.arch not in archs:
+                raise ConanInvalidConfiguration(f"cpu_profile={profile} is not available for {self.settings.arch}")
+            if is_msvc(self) and profile not in ["x86-64-v2", "x86-64-v3", "x86-64-v4"]:
+                raise ConanInvalidConfiguration(f"cpu_profile={profile} is not supported by MSVC")
+            if profile.startswith("x86-64-v"):
+                minimum_version = self._cpu_profile_compilers_minimum_version.get(str(self.settings.compiler), False)
+                if minimum_version and Version(self.settings.compiler.version) < minimum_version:
+                    raise ConanInvalidConfiguration(
+                        f"cpu_profile={profile} requires {self.settings.compiler} >= {minimum_version}"
+                    )
+            if profile == "native" and cross_building(self):
+                raise ConanInvalidConfiguration("cpu_profile=native can't be used when cross-building")
+        if self.options.fp_contract and is_msvc(self):
+            raise ConanInvalidConfiguration("fp_contract is not supported by MSVC")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root = Version(self.version) >= "1.2.3")
@@ -87,11 +152,21 @@ class Clipper2Conan(ConanFile):
             tc.variables["CLIPPER2_HI_PRECISION"] = self.options.with_hi_precision
         if "with_max_precision" in self.options:
             tc.variables["CLIPPER2_MAX_PRECISION"] = self.options.with_max_precision
+        if self.options.enable_lto:
+            tc.variables["CMAKE_INTERPROCEDURAL_OPTIMIZATION"] = True
+        if self.options.cpu_profile:
+            tc.extra_cxxflags.extend(self._cpu_profile_flags)
+        if self.options.fp_contract:
+            tc.extra_cxxflags.append(f"-ffp-contract={self.options.fp_contract}")
         tc.generate()
     
     def _patch_sources(self):
         apply_conandata_patches(self)
-        replace_in_file(self, os.path.join(self.source_folder, "CPP", "CMakeLists.txt"), "-Werror", "")
+        cmakelists = os.path.join(self.source_folder, "CPP", "CMakeLists.txt")
+        replace_in_file(self, cmakelists, "-Werror", "")
+        if self.options.with_benchmarks:
+            benchmark_folder = os.path.join(self.source_folder, "conan_benchmark").replace("\\", "/")
+            save(self, cmakelists, f'\nadd_subdirectory("{benchmark_folder}" conan_benchmark)\n', append=True)
 
     def build(self):
         self._patch_sources()
@@ -1,10 +1,13 @@
+import glob
+import hashlib
 import os
 import re
 import textwrap
 
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os, fix_apple_shared_install_name
+from conan.tools.build import can_run
 from conan.tools.env import VirtualRunEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, load, mkdir, replace_in_file, rm, rmdir, save, unzip
 from conan.tools.gnu import Autotools, AutotoolsToolchain, AutotoolsDeps, PkgConfigDeps
@@ -30,6 +33,7 @@ class CPythonConan(ConanFile):
         "fPIC": [True, False],
         "optimizations": [True, False],
         "lto": [True, False],
+        "pgo_training_script": [None, "ANY"],  # absolute path to a script replacing the default training set (-m test --pgo)
         "docstrings": [True, False],
         "pymalloc": [True, False],
         "with_bz2": [True, False],
@@ -48,6 +52,7 @@ class CPythonConan(ConanFile):
         "fPIC": True,
         "optimizations": False,
         "lto": False,
+        "pgo_training_script": None,
         "docstrings": True,
         "pymalloc": True,
         "with_bz2": True,
@@ -93,6 +98,8 @@ class CPythonConan(ConanFile):
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        if not self.options.optimizations:
+            self.options.rm_safe("pgo_training_script")
         if not self._supports_modules:
             self.options.rm_safe("with_bz2")
             self.options.rm_safe("with_sqlite3")
@@ -150,6 +157,12 @@ class CPythonConan(ConanFile):
 
     def package_id(self):
         del self.info.options.env_vars
+        # The content of the training script defines the profile data, not where it was stored.
+        # The package id is also the key of the profile data cache.
+        script = str(self.info.options.get_safe("pgo_training_script"))
+        if script != "None" and os.path.isfile(script):
+            with open(script, "rb") as f:
+                self.info.options.pgo_training_script = hashlib.sha256(f.read()).hexdigest()
 
     def validate(self):
         if self.options.shared:
@@ -158,15 +171,10 @@ class CPythonConan(ConanFile):
                     "cpython does not support MT(d) runtime when building a shared cpython library"
                 )
         if is_msvc(self):
-            if self.options.optimizations:
+            if self.options.optimizations and self.settings.build_type == "Debug":
                 raise ConanInvalidConfiguration(
-                    "This recipe does not support optimized MSVC cpython builds (yet)"
+                    "Optimized MSVC cpython builds use the PGInstrument/PGUpdate configurations, which are Release only"
                 )
-                # FIXME: should probably throw when cross building
-                # FIXME: optimizations for Visual Studio, before building the final `build_type`:
-                # 1. build the MSVC PGInstrument build_type,
-                # 2. run the instrumented binaries, (PGInstrument should have created a `python.bat` file in the PCbuild folder)
-                # 3. build the MSVC PGUpdate build_type
             if self.settings.build_type == "Debug" and "d" not in msvc_runtime_flag(self):
                 raise ConanInvalidConfiguration(
                     "Building debug cpython requires a debug runtime (Debug cpython requires _CrtReportMode"
@@ -190,6 +198,15 @@ class CPythonConan(ConanFile):
         if self.settings.compiler == "gcc" and Version(self.settings.compiler.version).major == 9 and Version(self.version) >= "3.12":
             raise ConanInvalidConfiguration("FIXME: GCC 9 produces an internal compiler error locally, and a link error in CCI")
 
+    def validate_build(self):
+        if self.options.optimizations and not can_run(self) and not self.conf.get("user.cpython:pgo_cache_folder"):
+            raise ConanInvalidConfiguration(
+                "Profile-guided optimizations need to run the instrumented interpreter, which is not possible"
+                " when cross building. Provide profile data collected from a native build of the same"
+                " configuration as an user Conan conf variable:\n\n"
+                "[conf]\nuser.cpython:pgo_cache_folder=/path/to/pgo/cache"
+            )
+
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
@@ -247,13 +264,16 @@ class CPythonConan(ConanFile):
         VirtualRunEnv(self).generate(scope="build")
 
         if is_msvc(self):
-            # The msbuild generator only works with Visual Studio
-            deps = MSBuildDeps(self)
-            deps.generate()
-            # The toolchain.props is not injected yet, but it also generates VCVars
-            toolchain = MSBuildToolchain(self)
-            toolchain.properties["IncludeExternals"] = "true"
-            toolchain.generate()
+            for configuration in self._msvc_configurations:
+                # The msbuild generator only works with Visual Studio
+                deps = MSBuildDeps(self)
+                deps.configuration = configuration
+                deps.generate()
+                # The toolchain.props is not injected yet, but it also generates VCVars
+                toolchain = MSBuildToolchain(self)
+                toolchain.configuration = configuration
+                toolchain.properties["IncludeExternals"] = "true"
+                toolchain.generate()
         else:
             self._generate_autotools()
 
@@ -526,9 +546,18 @@ class CPythonConan(ConanFile):
         }
         return archs
 
-    def _msvc_build(self):
+    @property
+    def _msvc_configurations(self):
+        if self.options.optimizations:
+            return ["PGInstrument", "PGUpdate"]
+        # Use the default configuration, derived from build_type
+        return [None]
+
+    def _msvc_build_configuration(self, configuration=None):
         msbuild = MSBuild(self)
         msbuild.platform = self._msvc_archs[str(self.settings.arch)]
+        if configuration:
+            msbuild.build_type = configuration
 
         projects = self._solution_projects
         self.output.info(f"Building {len(projects)} Visual Studio projects: {projects}")
@@ -538,14 +567,111 @@ class CPythonConan(ConanFile):
         cmd = msbuild.command(sln, targets=projects)
         self.run(f"{cmd} /p:PlatformToolset={msvs_toolset(self)}")
 
+    def _msvc_build(self):
+        if not self.options.optimizations:
+            self._msvc_build_configuration()
+            return
+        if not self._restore_pgo_profile():
+            self._msvc_build_configuration("PGInstrument")
+            instrumented_path = self._pgo_profile_folder
+            self._copy_essential_dlls(instrumented_path)
+            rm(self, "*.pgc", instrumented_path)
+            self._run_pgo_training(os.path.join(instrumented_path, self._cpython_interpreter_name))
+            self._check_pgo_profile()
+            self._save_pgo_profile()
+        self._msvc_build_configuration("PGUpdate")
+
+    def _autotools_build(self):
+        autotools = Autotools(self)
+        autotools.configure()
+        if not self.options.optimizations:
+            autotools.make()
+            return
+        # The profile-opt target (default with --enable-optimizations) does the instrumented build,
+        # the training run and the optimized rebuild. The training part is skipped if profile-run-stamp exists.
+        make_args = []
+        restored = self._restore_pgo_profile()
+        if restored:
+            save(self, os.path.join(self.build_folder, "profile-run-stamp"), "")
+        elif self.options.pgo_training_script:
+            make_args.append(f"PROFILE_TASK=\"{self._pgo_training_script}\"")
+        autotools.make(args=make_args)
+        if not restored:
+            # profile-opt ignores the exit code of the training run, but without profile data the build is not optimized
+            self._check_pgo_profile()
+            self._save_pgo_profile()
+
+    @property
+    def _pgo_training_script(self):
+        return str(self.options.pgo_training_script)
+
+    @property
+    def _pgo_cache_folder(self):
+        # Profile data only depends on the sources and on the package configuration,
+        # so it can be reused across builds of the same package id.
+        cache_root = self.conf.get("user.cpython:pgo_cache_folder", check_type=str)
+        if not cache_root:
+            return None
+        return os.path.join(cache_root, f"{self.name}-{self.version}", self.info.package_id())
+
+    @property
+    def _pgo_profile_folder(self):
+        if is_msvc(self):
+            return os.path.join(self._msvc_artifacts_path, "instrumented")
+        return self.build_folder
+
+    @property
+    def _pgo_profile_patterns(self):
+        if is_msvc(self):
+            return ["*.pgd", "*.pgc"]
+        # gcc writes a .gcda file next to every object, clang merges its raw profiles into a single file
+        return ["*.gcda", "code.profclangd"]
+
+    def _run_pgo_training(self, python):
+        if self.options.pgo_training_script:
+            training_args = f"\"{self._pgo_training_script}\""
+        else:
+            training_args = "-m test --pgo"
+        self.output.info("Running code to generate profile data (this can take a while)")
+        returncode = self.run(f"\"{python}\" {training_args}", ignore_errors=True)
+        if returncode != 0:
+            if self.options.pgo_training_script:
+                raise ConanException(f"PGO training script {self._pgo_training_script} failed with exit code {returncode}")
+            # Like upstream, failing tests of the default training set do not invalidate the profile data
+            self.output.warning(f"Some tests of the PGO training set failed (exit code {returncode}), using the profile data anyway")
+
+    def _check_pgo_profile(self):
+        # The .pgd database is written by the instrumented link already, only the .pgc files come from the training run
+        patterns = ["*.pgc"] if is_msvc(self) else self._pgo_profile_patterns
+        for pattern in patterns:
+            if glob.glob(os.path.join(self._pgo_profile_folder, "**", pattern), recursive=True):
+                return
+        raise ConanException(f"The PGO training run did not write any profile data ({', '.join(patterns)}) "
+                             f"to {self._pgo_profile_folder}")
+
+    def _restore_pgo_profile(self):
+        cache_folder = self._pgo_cache_folder
+        if cache_folder and os.path.isdir(cache_folder):
+            self.output.info(f"Reusing profile data from {cache_folder}")
+            copy(self, "*", src=cache_folder, dst=self._pgo_profile_folder)
+            return True
+        if not can_run(self):
+            raise ConanException(f"No profile data found in {cache_folder}, and the training run cannot be executed when cross building")
+        return False
+
+    def _save_pgo_profile(self):
+        cache_folder = self._pgo_cache_folder
+        if cache_folder:
+            self.output.info(f"Saving profile data to {cache_folder}")
+            for pattern in self._pgo_profile_patterns:
+                copy(self, pattern, src=self._pgo_profile_folder, dst=cache_folder)
+
     def build(self):
         self._patch_sources()
         if is_msvc(self):
             self._msvc_build()
         else:
-            autotools = Autotools(self)
-            autotools.configure()
-            autotools.make()
+            self._autotools_build()
 
     @property
     def _msvc_artifacts_path(self):
@@ -562,11 +688,11 @@ class CPythonConan(ConanFile):
     def _msvc_install_subprefix(self):
         return "bin"
 
-    def _copy_essential_dlls(self):
+    def _copy_essential_dlls(self, dest_path=None):
         if is_msvc(self):
             # Until MSVC builds support cross building, copy dll's of essential (shared) dependencies to python binary location.
-            # These dll's are required when running the layout tool using the newly built python executable.
-            dest_path = os.path.join(self.build_folder, self._msvc_artifacts_path)
+            # These dll's are required when running the layout tool (or the PGO training) using the newly built python executable.
+            dest_path = dest_path or os.path.join(self.build_folder, self._msvc_artifacts_path)
             for bin_path in self.dependencies["libffi"].cpp_info.bindirs:
                 copy(self, "*.dll", src=bin_path, dst=dest_path)
             for bin_path in self.dependencies["expat"].cpp_info.bindirs:
@@ -21,19 +21,38 @@ class FaissConan(ConanFile):
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
+        "opt_level": ["generic", "avx2", "avx512", "sve"],
+        "blas": ["openblas", "reference"],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
+        "opt_level": "generic",
+        "blas": "openblas",
+    }
+    options_description = {
+        "opt_level": "FAISS_OPT_LEVEL: also build and package the faiss_avx2, faiss_avx512 or faiss_sve variant of the library",
+        "blas": "BLAS/LAPACK backend: openblas (set openblas/*:dynamic_arch=True for runtime kernel selection) or the system reference BLAS/LAPACK",
     }
 
     implements = ["auto_shared_fpic"]
 
+    @property
+    def _opt_level_components(self):
+        # Every variant is a full build of faiss, and avx512 also installs the avx2 one
+        return {
+            "generic": [],
+            "avx2": ["faiss_avx2"],
+            "avx512": ["faiss_avx2", "faiss_avx512"],
+            "sve": ["faiss_sve"],
+        }[str(self.options.opt_level)]
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
     def requirements(self):
-        self.requires("openblas/[^0.3.27]")
+        if self.options.blas == "openblas":
+            self.requires("openblas/[^0.3.27]")
         self.requires("gflags/2.2.2")
 
     def build_requirements(self):
@@ -46,6 +65,15 @@ class FaissConan(ConanFile):
             raise ConanInvalidConfiguration("OpenMP support is required, which is not "
                                             "available in Apple Clang")
 
+        if self.options.opt_level in ("avx2", "avx512") and self.settings.arch != "x86_64":
+            raise ConanInvalidConfiguration(f"{self.ref} opt_level={self.options.opt_level} requires x86_64")
+        if self.options.opt_level == "sve" and self.settings.arch != "armv8":
+            raise ConanInvalidConfiguration(f"{self.ref} opt_level=sve requires armv8")
+        if self.options.blas == "openblas" and not self.dependencies["openblas"].options.build_lapack:
+            raise ConanInvalidConfiguration(f"{self.ref} requires openblas/*:build_lapack=True")
+        if self.options.blas == "reference" and self.settings.os not in ["Linux", "FreeBSD"]:
+            raise ConanInvalidConfiguration(f"{self.ref} blas=reference is only supported on Linux and FreeBSD")
+
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
         replace_in_file(self, os.path.join(self.source_folder, "CMakeLists.txt"),
@@ -57,6 +85,9 @@ class FaissConan(ConanFile):
         tc.cache_variables["BUILD_TESTING"] = False
         tc.cache_variables["FAISS_ENABLE_PYTHON"] = False
         tc.cache_variables["CMAKE_TRY_COMPILE_CONFIGURATION"] = str(self.settings.build_type)
+        tc.cache_variables["FAISS_OPT_LEVEL"] = str(self.options.opt_level)
+        # Make FindBLAS/FindLAPACK pick the selected backend over anything else installed
+        tc.cache_variables["BLA_VENDOR"] = "OpenBLAS" if self.options.blas == "openblas" else "Generic"
 
         tc.generate()
 
@@ -79,14 +110,24 @@ class FaissConan(ConanFile):
         rm(self, "*.pdb", self.package_folder, recursive=True)
 
     def package_info(self):
-        self.cpp_info.libs = ["faiss"]
-
         self.cpp_info.set_property("cmake_file_name", "faiss")
+        # With opt_level != generic, faiss links every packaged variant: link exactly one of
+        # faiss::faiss, faiss_avx2, faiss_avx512 or faiss_sve to get a single implementation
         self.cpp_info.set_property("cmake_target_name", "faiss")
 
-        if self.settings.os in ["Linux", "FreeBSD"]:
-            self.cpp_info.system_libs = ["m", "dl"]
-
-        if not self.options.shared and self.settings.compiler in ("clang", "gcc"):
-            self.cpp_info.exelinkflags.append("-fopenmp")
-            self.cpp_info.sharedlinkflags.append("-fopenmp")
+        for name in ["faiss"] + self._opt_level_components:
+            component = self.cpp_info.components[name]
+            component.set_property("cmake_target_name", "faiss::faiss" if name == "faiss" else name)
+            component.libs = [name]
+            if self.options.blas == "openblas":
+                component.requires = ["openblas::openblas", "gflags::gflags"]
+            else:
+                component.requires = ["gflags::gflags"]
+                component.system_libs = ["lapack", "blas"]
+
+            if self.settings.os in ["Linux", "FreeBSD"]:
+                component.system_libs.extend(["m", "dl"])
+
+            if not self.options.shared and self.settings.compiler in ("clang", "gcc"):
+                component.exelinkflags.append("-fopenmp")
+                component.sharedlinkflags.append("-fopenmp")
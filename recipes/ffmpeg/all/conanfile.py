@@ -41,6 +41,8 @@ class FFMpegConan(ConanFile):
         "postproc": [True, False],
         "avfilter": [True, False],
         "with_asm": [True, False],
+        "threads": ["auto", "pthreads", "w32threads", "none"],
+        "disable_simd": [None, "ANY"],
         "with_zlib": [True, False],
         "with_bzip2": [True, False],
         "with_lzma": [True, False],
@@ -79,6 +81,7 @@ class FFMpegConan(ConanFile):
         "with_audiotoolbox": [True, False],
         "with_videotoolbox": [True, False],
         "with_programs": [True, False],
+        "with_benchmark_tools": [True, False],
         "with_libsvtav1": [True, False],
         "with_libaom": [True, False],
         "with_libdav1d": [True, False],
@@ -133,6 +136,8 @@ class FFMpegConan(ConanFile):
         "postproc": True,
         "avfilter": True,
         "with_asm": True,
+        "threads": "auto",
+        "disable_simd": None,
         "with_zlib": True,
         "with_bzip2": True,
         "with_lzma": True,
@@ -171,6 +176,7 @@ class FFMpegConan(ConanFile):
         "with_audiotoolbox": True,
         "with_videotoolbox": True,
         "with_programs": True,
+        "with_benchmark_tools": False,
         "with_libsvtav1": True,
         "with_libaom": True,
         "with_libdav1d": True,
@@ -253,6 +259,7 @@ class FFMpegConan(ConanFile):
             "with_soxr": ["swresample"],
             "with_pulse": ["avdevice"],
             "with_sdl": ["with_programs"],
+            "with_benchmark_tools": ["with_programs"],
             "with_libsvtav1": ["avcodec"],
             "with_libaom": ["avcodec"],
             "with_libdav1d": ["avcodec"],
@@ -270,6 +277,34 @@ class FFMpegConan(ConanFile):
         # https://github.com/FFmpeg/FFmpeg/compare/n6.0.1...n6.1#diff-90d08e583c4c9c6f391b2ae90f819f600a6326928ea9512c9e0c6d98e9f29ac2R235
         return Version(self.version) >= "6.1"
 
+    @property
+    def _simd_extensions(self):
+        # SIMD extensions that FFmpeg's configure accepts with --disable-<name> for the target arch,
+        # older configure scripts fail on unknown options
+        version = Version(self.version)
+        arch = str(self.settings.arch)
+        extensions = []
+        if arch in ["x86", "x86_64"]:
+            extensions = ["mmx", "mmxext", "sse", "sse2", "sse3", "ssse3", "sse4", "sse42",
+                          "avx", "xop", "fma3", "fma4", "avx2", "avx512", "aesni"]
+            if version < "7.0":
+                extensions += ["amd3dnow", "amd3dnowext"]
+            if version >= "5.0":
+                extensions.append("avx512icl")
+        elif arch.startswith("armv8"):
+            extensions = ["neon"]
+            if version >= "6.1":
+                extensions += ["dotprod", "i8mm"]
+            if version >= "8.0":
+                extensions += ["sve", "sve2"]
+        elif arch.startswith("arm"):
+            extensions = ["armv5te", "armv6", "armv6t2", "vfp", "neon"]
+        return extensions
+
+    @property
+    def _disabled_simd(self):
+        return list(filter(None, "".join(str(self.options.disable_simd or "").split()).split(",")))
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -412,6 +447,21 @@ class FFMpegConan(ConanFile):
                 raise ConanInvalidConfiguration("FFmpeg '{}' option requires '{}' option to be enabled".format(
                     dependency, "' or '".join(features)))
 
+        if self.options.threads == "w32threads" and self.settings.os != "Windows":
+            raise ConanInvalidConfiguration("w32threads threading backend is only available on Windows")
+        if self.options.threads == "none" and self.options.with_programs and Version(self.version) >= "7.0":
+            # the ffmpeg program runs its demuxers, decoders and muxers in separate threads since 7.0
+            raise ConanInvalidConfiguration("FFmpeg 'with_programs' option requires a threading backend, set 'threads' option")
+
+        unknown_simd = [name for name in self._disabled_simd if name not in self._simd_extensions]
+        if unknown_simd:
+            raise ConanInvalidConfiguration("FFmpeg {} 'disable_simd' option contains SIMD extensions unknown for {}: {}. Valid values are: {}".format(
+                self.version, self.settings.arch, ", ".join(unknown_simd), ", ".join(self._simd_extensions) or "none"))
+
+        if self.options.with_benchmark_tools and self.options.shared:
+            # checkasm links the internal static libraries, which are not built with --disable-static
+            raise ConanInvalidConfiguration("FFmpeg 'with_benchmark_tools' option requires shared=False")
+
         if Version(self.version) >= "6.1" and conan_version.major == 1 and is_msvc(self) and self.options.shared:
             # Linking fails with "Argument list too long" for some reason on Conan v1
             raise ConanInvalidConfiguration("MSVC shared build is not supported for Conan v1")
@@ -539,6 +589,7 @@ class FFMpegConan(ConanFile):
             "--disable-doc",
             opt_enable_disable("cross-compile", cross_building(self)),
             opt_enable_disable("asm", self.options.with_asm),
+            *[f"--disable-{name}" for name in self._disabled_simd],
             # Libraries
             opt_enable_disable("shared", self.options.shared),
             opt_enable_disable("static", not self.options.shared),
@@ -691,6 +742,12 @@ class FFMpegConan(ConanFile):
             ])
         if not self.options.with_programs:
             args.append("--disable-programs")
+        if self.options.threads == "pthreads":
+            args.extend(["--enable-pthreads", "--disable-w32threads"])
+        elif self.options.threads == "w32threads":
+            args.extend(["--disable-pthreads", "--enable-w32threads"])
+        elif self.options.threads == "none":
+            args.extend(["--disable-pthreads", "--disable-w32threads", "--disable-os2threads"])
         # since ffmpeg"s build system ignores CC and CXX
         compilers_from_conf = self.conf.get("tools.build:compiler_executables", default={}, check_type=dict)
         buildenv_vars = VirtualBuildEnv(self).vars()
@@ -803,11 +860,16 @@ class FFMpegConan(ConanFile):
         autotools = Autotools(self)
         autotools.configure()
         autotools.make()
+        if self.options.with_benchmark_tools:
+            autotools.make(target="checkasm")
 
     def package(self):
         copy(self, "LICENSE.md", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
         autotools = Autotools(self)
         autotools.install()
+        if self.options.with_benchmark_tools:
+            copy(self, "checkasm*", src=os.path.join(self.build_folder, "tests", "checkasm"),
+                 dst=os.path.join(self.package_folder, "bin"), excludes=("*.c", "*.d", "*.o", "*.h", "*.S", "*.asm"))
         rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
         rmdir(self, os.path.join(self.package_folder, "share"))
         if is_msvc(self):
@@ -889,7 +951,9 @@ class FFMpegConan(ConanFile):
             _add_component("postproc", [])
 
         if self.settings.os in ("FreeBSD", "Linux"):
-            avutil.system_libs.extend(["pthread", "dl"])
+            avutil.system_libs.append("dl")
+            if self.options.threads != "none":
+                avutil.system_libs.append("pthread")
             if self.options.get_safe("fPIC"):
                 if self.settings.compiler in ("gcc", "clang"):
                     # https://trac.ffmpeg.org/ticket/1713
@@ -897,7 +961,7 @@ class FFMpegConan(ConanFile):
                     # https://ffmpeg.org/pipermail/libav-user/2014-December/007719.html
                     avcodec.exelinkflags.append("-Wl,-Bsymbolic")
                     avcodec.sharedlinkflags.append("-Wl,-Bsymbolic")
-            if self.options.avfilter:
+            if self.options.avfilter and self.options.threads != "none":
                 avfilter.system_libs.append("pthread")
         elif self.settings.os == "Windows":
             if self.options.avcodec:
@@ -1,12 +1,13 @@
 import os
+import re
 import yaml
 
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, valid_min_cppstd, check_min_cppstd
 from conan.tools.cmake import cmake_layout, CMake, CMakeToolchain, CMakeDeps
-from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rename, replace_in_file, rmdir
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, load, rename, replace_in_file, rmdir, save
 from conan.tools.microsoft import check_min_vs, is_msvc
 from conan.tools.scm import Version
 
@@ -38,7 +39,9 @@ class GrpcConan(ConanFile):
         "ruby_plugin": [True, False],
         "otel_plugin": [True, False],
         "secure": [True, False],
-        "with_libsystemd": [True, False]
+        "with_libsystemd": [True, False],
+        "poll_strategy": [None, "epoll1", "poll"],
+        "experiments": [None, "ANY"],
     }
     default_options = {
         "shared": False,
@@ -54,7 +57,16 @@ class GrpcConan(ConanFile):
         "ruby_plugin": True,
         "otel_plugin": False,
         "secure": False,
-        "with_libsystemd": False
+        "with_libsystemd": False,
+        "poll_strategy": None,
+        "experiments": None,
+    }
+    options_description = {
+        "poll_strategy": "Polling engine used by default, instead of trying all of them. "
+                         "The GRPC_POLL_STRATEGY environment variable still takes precedence",
+        "experiments": "Comma separated list of experiments enabled by default (or disabled with a '-' prefix), "
+                       "e.g. 'event_engine_client,event_engine_listener'. "
+                       "The GRPC_EXPERIMENTS environment variable still takes precedence",
     }
 
     _target_info = None
@@ -86,6 +98,11 @@ class GrpcConan(ConanFile):
             del self.options.with_libsystemd
         if Version(self.version) < "1.65.0":
             del self.options.otel_plugin
+        if self.settings.os == "Windows":
+            del self.options.poll_strategy
+        if Version(self.version) < "1.54.0":
+            # The experiments framework is not available in all 1.50.x releases
+            del self.options.experiments
 
     def configure(self):
         if self.options.shared:
@@ -148,6 +165,15 @@ class GrpcConan(ConanFile):
         if abseil_cppstd != self.settings.compiler.cppstd:
             raise ConanInvalidConfiguration(f"grpc and abseil must be built with the same compiler.cppstd setting")
 
+        if self.options.get_safe("poll_strategy") == "epoll1" and self.settings.os not in ["Linux", "Android"]:
+            raise ConanInvalidConfiguration(f"{self.ref} epoll1 poll strategy is only available on Linux and Android")
+
+        experiments = self.options.get_safe("experiments")
+        if experiments and not re.fullmatch(r"-?[a-z0-9_]+(,-?[a-z0-9_]+)*", str(experiments)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref} option experiments must be a comma separated list of experiment names, got '{experiments}'"
+            )
+
     def build_requirements(self):
         # cmake >=3.25 required to use `cmake -E env --modify` below
         # note: grpc 1.69.0 requires cmake >=3.16
@@ -258,6 +284,42 @@ class GrpcConan(ConanFile):
             target_link_options(upb_json_lib PRIVATE -Wl,-undefined,dynamic_lookup)
             """)
 
+        # Default runtime configuration, which can still be overridden through the environment
+        poll_strategy = self.options.get_safe("poll_strategy")
+        if poll_strategy:
+            self._set_config_var_default("poll_strategy", "all", poll_strategy)
+        experiments = self.options.get_safe("experiments")
+        if experiments:
+            self._set_config_var_default("experiments", "", experiments)
+
+    @property
+    def _config_var_defaults(self):
+        # Where the default value of GRPC_POLL_STRATEGY and GRPC_EXPERIMENTS is defined:
+        #  - >= 1.65.0: LoadConfig(..., overrides.<name>, "<default>") in the generated config_vars.cc
+        #  - older versions: GPR_GLOBAL_CONFIG_DEFINE_STRING(grpc_<name>, "<default>", ...)
+        if Version(self.version) >= "1.65.0":
+            folder = "config" if os.path.isfile(os.path.join(self.source_folder, "src", "core", "config", "config_vars.cc")) \
+                     else os.path.join("lib", "config")
+            config_vars = os.path.join("src", "core", folder, "config_vars.cc")
+            return {
+                "poll_strategy": (config_vars, r"(overrides\.poll_strategy,\s*)"),
+                "experiments": (config_vars, r"(overrides\.experiments,\s*)"),
+            }
+        return {
+            "poll_strategy": (os.path.join("src", "core", "lib", "iomgr", "ev_posix.cc"),
+                              r"(GPR_GLOBAL_CONFIG_DEFINE_STRING\(\s*grpc_poll_strategy,\s*)"),
+            "experiments": (os.path.join("src", "core", "lib", "experiments", "config.cc"),
+                            r"(GPR_GLOBAL_CONFIG_DEFINE_STRING\(\s*grpc_experiments,\s*)"),
+        }
+
+    def _set_config_var_default(self, name, default, value):
+        path, prefix = self._config_var_defaults[name]
+        path = os.path.join(self.source_folder, path)
+        content, count = re.subn(prefix + re.escape(f'"{default}"'), rf'\g<1>"{value}"', load(self, path))
+        if count != 1:
+            raise ConanException(f"{self.ref} could not set the default of GRPC_{name.upper()} in {path}")
+        save(self, path, content)
+
     def build(self):
         self._patch_sources()
         cmake = CMake(self)
@@ -8,6 +8,7 @@ from conan.tools.microsoft import is_msvc, is_msvc_static_runtime
 from conan.tools.scm import Version
 import os
 import shutil
+import stat
 
 required_conan_version = ">=1.54.0"
 
@@ -35,6 +36,9 @@ class JemallocConan(ConanFile):
         "enable_initial_exec_tls": [True, False],
         "enable_libdl": [True, False],
         "enable_prof": [True, False],
+        "lg_page": [None, "ANY"],
+        "lg_quantum": [None, "ANY"],
+        "malloc_conf": [None, "ANY"],
     }
     default_options = {
         "shared": False,
@@ -50,6 +54,15 @@ class JemallocConan(ConanFile):
         "enable_initial_exec_tls": True,
         "enable_libdl": True,
         "enable_prof": False,
+        "lg_page": None,
+        "lg_quantum": None,
+        "malloc_conf": None,
+    }
+    options_description = {
+        "lg_page": "Base 2 log of the system page size (--with-lg-page), e.g. 16 for 64 KiB pages. Detected at build time if not set",
+        "lg_quantum": "Base 2 log of the minimum allocation alignment (--with-lg-quantum)",
+        "malloc_conf": "Default run-time options embedded into the library (--with-malloc-conf), "
+                       "e.g. background_thread:true,dirty_decay_ms:10000",
     }
 
     @property
@@ -124,6 +137,13 @@ class JemallocConan(ConanFile):
         if self.settings.os == "Macos" and self.settings.arch == "armv8":
             if Version(self.version) < "5.3.0":
                 raise ConanInvalidConfiguration("Support for Apple Silicon is only available as of 5.3.0.")
+        # 4. Tuning options
+        for option in ["lg_page", "lg_quantum"]:
+            value = self.options.get_safe(option)
+            if value and not str(value).isdigit():
+                raise ConanInvalidConfiguration(f"{self.ref} option {option} must be an integer, got '{value}'")
+        if self.options.malloc_conf and any(c.isspace() for c in str(self.options.malloc_conf)):
+            raise ConanInvalidConfiguration(f"{self.ref} option malloc_conf must not contain whitespaces")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -147,6 +167,12 @@ class JemallocConan(ConanFile):
             enable_disable("libdl", self.options.enable_libdl),
             enable_disable("prof", self.options.enable_prof),
         ])
+        if self.options.lg_page:
+            tc.configure_args.append(f"--with-lg-page={self.options.lg_page}")
+        if self.options.lg_quantum:
+            tc.configure_args.append(f"--with-lg-quantum={self.options.lg_quantum}")
+        if self.options.malloc_conf:
+            tc.configure_args.append(f"--with-malloc-conf={self.options.malloc_conf}")
         env = tc.environment()
         if is_msvc(self):
             # Do not check whether the math library exists when compiled by MSVC
@@ -168,6 +194,11 @@ class JemallocConan(ConanFile):
         autotools = Autotools(self)
         autotools.install(target="install_lib_shared" if self.options.shared else "install_lib_static")
         autotools.install(target="install_include")
+        if self.options.enable_prof:
+            # jeprof is generated by configure for the given prefix and build options
+            copy(self, "jeprof", src=os.path.join(self.build_folder, "bin"), dst=os.path.join(self.package_folder, "bin"))
+            jeprof = os.path.join(self.package_folder, "bin", "jeprof")
+            os.chmod(jeprof, os.stat(jeprof).st_mode | stat.S_IEXEC)
         if self.settings.os == "Windows" and self.settings.compiler == "gcc":
             rename(self, os.path.join(self.package_folder, "lib", f"{self._library_name}.lib"),
                          os.path.join(self.package_folder, "lib", f"lib{self._library_name}.a"))
@@ -8,6 +8,7 @@ from conan.tools.files import copy, download, get, load, replace_in_file, rm, rm
 from conan.tools.gnu import Autotools, AutotoolsToolchain, AutotoolsDeps, PkgConfigDeps
 from conan.tools.layout import basic_layout
 from conan.tools.microsoft import is_msvc, unix_path
+from conan.tools.scm import Version
 
 import os
 import re
@@ -53,6 +54,7 @@ class LibcurlConan(ConanFile):
         "with_libpsl": [True, False],
         "with_largemaxwritesize": [True, False],
         "with_nghttp2": [True, False],
+        "with_http3": [True, False],
         "with_zlib": [True, False],
         "with_brotli": [True, False],
         "with_zstd": [True, False],
@@ -102,6 +104,7 @@ class LibcurlConan(ConanFile):
         "with_libpsl": False,
         "with_largemaxwritesize": False,
         "with_nghttp2": False,
+        "with_http3": False,
         "with_zlib": True,
         "with_brotli": False,
         "with_zstd": False,
@@ -161,7 +164,11 @@ class LibcurlConan(ConanFile):
 
     def requirements(self):
         if self.options.with_ssl == "openssl":
-            self.requires("openssl/[>=1.1 <4]")
+            if self.options.with_http3:
+                # QUIC API used by curl's OpenSSL HTTP/3 backend
+                self.requires("openssl/[>=3.3 <4]")
+            else:
+                self.requires("openssl/[>=1.1 <4]")
         elif self.options.with_ssl == "libressl":
             self.requires("libressl/[>=3.5 <4]")
         elif self.options.with_ssl == "wolfssl":
@@ -170,6 +177,8 @@ class LibcurlConan(ConanFile):
             self.requires("mbedtls/3.5.0")
         if self.options.with_nghttp2:
             self.requires("libnghttp2/[>=1.59.0 <2]")
+        if self.options.with_http3:
+            self.requires("nghttp3/[>=1.1.0 <2]")
         if self.options.with_libssh2:
             self.requires("libssh2/1.11.0")
         if self.options.with_zlib:
@@ -195,6 +204,16 @@ class LibcurlConan(ConanFile):
             openssl = self.dependencies["openssl"]
             if self.options.with_ntlm and openssl.options.no_des:
                 raise ConanInvalidConfiguration("option with_ntlm=True requires openssl/*:no_des=False")
+        if self.options.with_http3:
+            if self.options.with_ssl != "openssl":
+                raise ConanInvalidConfiguration("option with_http3=True requires with_ssl=openssl")
+            if Version(self.dependencies["openssl"].ref.version) < "3.3":
+                raise ConanInvalidConfiguration("option with_http3=True requires openssl >= 3.3 (QUIC support)")
+            if not self.options.with_http:
+                raise ConanInvalidConfiguration("option with_http3=True requires with_http=True")
+            if Version(self.version) < "8.10.0":
+                # --with-openssl-quic / USE_OPENSSL_QUIC
+                raise ConanInvalidConfiguration("option with_http3=True requires libcurl >= 8.10.0 (OpenSSL QUIC support)")
         if self.options.with_ssl == "wolfssl" and not self.dependencies["wolfssl"].options.with_curl:
             raise ConanInvalidConfiguration("option with_ssl=wolfssl requires wolfssl/*:with_curl=True")
 
@@ -433,6 +452,12 @@ class LibcurlConan(ConanFile):
         else:
             tc.configure_args.append("--without-nghttp2")
 
+        if self.options.with_http3:
+            path = unix_path(self, self.dependencies["nghttp3"].package_folder)
+            tc.configure_args.extend(["--with-openssl-quic", f"--with-nghttp3={path}"])
+        else:
+            tc.configure_args.append("--without-nghttp3")
+
         if self.options.with_zlib:
             path = unix_path(self, self.dependencies["zlib"].package_folder)
             tc.configure_args.append(f"--with-zlib={path}")
@@ -566,6 +591,8 @@ class LibcurlConan(ConanFile):
         tc.variables["CURL_USE_WOLFSSL"] = self.options.with_ssl == "wolfssl"
         tc.variables["CURL_USE_MBEDTLS"] = self.options.with_ssl == "mbedtls"
         tc.variables["USE_NGHTTP2"] = self.options.with_nghttp2
+        tc.variables["USE_OPENSSL_QUIC"] = self.options.with_http3
+        tc.variables["USE_NGHTTP3"] = self.options.with_http3
         tc.variables["CURL_ZLIB"] = self.options.with_zlib
         tc.variables["CURL_BROTLI"] = self.options.with_brotli
         tc.variables["CURL_ZSTD"] = self.options.with_zstd
@@ -637,6 +664,10 @@ class LibcurlConan(ConanFile):
         if self.options.with_c_ares:
             deps.set_property("c-ares", "cmake_file_name", "Cares")
 
+        if self.options.with_http3:
+            deps.set_property("nghttp3", "cmake_file_name", "NGHTTP3")
+            deps.set_property("nghttp3", "cmake_additional_variables_prefixes", ["NGHTTP3"])
+
         if self.options.with_libidn:
             deps.set_property("libidn2", "cmake_file_name", "Libidn2")
             deps.set_property("libidn2", "cmake_additional_variables_prefixes", ["LIBIDN2"])
@@ -714,6 +745,8 @@ class LibcurlConan(ConanFile):
             self.cpp_info.components["curl"].requires.append("mbedtls::mbedtls")
         if self.options.with_nghttp2:
             self.cpp_info.components["curl"].requires.append("libnghttp2::libnghttp2")
+        if self.options.with_http3:
+            self.cpp_info.components["curl"].requires.append("nghttp3::nghttp3")
         if self.options.with_libssh2:
             self.cpp_info.components["curl"].requires.append("libssh2::libssh2")
         if self.options.with_zlib:
@@ -1,6 +1,6 @@
 from conan import ConanFile
 from conan.tools.build import can_run
-from conan.tools.cmake import cmake_layout, CMake
+from conan.tools.cmake import cmake_layout, CMake, CMakeToolchain
 import os
 import subprocess
 import re
@@ -8,7 +8,7 @@ import re
 
 class TestPackageConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
-    generators = "CMakeDeps", "CMakeToolchain", "VirtualRunEnv"
+    generators = "CMakeDeps", "VirtualRunEnv"
     test_type = "explicit"
 
     def requirements(self):
@@ -17,6 +17,16 @@ class TestPackageConan(ConanFile):
     def layout(self):
         cmake_layout(self)
 
+    @property
+    def _benchmark(self):
+        # Opt-in: -c user.libcurl:benchmark=True
+        return self.conf.get("user.libcurl:benchmark", default=False, check_type=bool)
+
+    def generate(self):
+        tc = CMakeToolchain(self)
+        tc.cache_variables["LIBCURL_BENCHMARK"] = self._benchmark
+        tc.generate()
+
     def build(self):
         cmake = CMake(self)
         cmake.configure()
@@ -35,3 +45,22 @@ class TestPackageConan(ConanFile):
             self.run(self._test_executable, env="conanrun")
             if self.dependencies[self.tested_reference_str].options.build_executable:
                 self.run("curl --version", env="conanrun")
+            if self._benchmark:
+                self._run_benchmark()
+
+    def _run_benchmark(self):
+        # HTTP/2 and HTTP/3 need a local server, e.g. nghttpx or h2o:
+        # -c user.libcurl:benchmark_urls="{'2': 'https://localhost:8443/1m', '3': 'https://localhost:8443/1m'}"
+        bench = os.path.join(self.cpp.build.bindirs[0], "test_multi_bench")
+        curl_options = self.dependencies[self.tested_reference_str].options
+        if self.settings.os != "Windows":
+            self.run(f"{bench} --http 1.1 --loop poll", env="conanrun")
+            if self.settings.os == "Linux":
+                self.run(f"{bench} --http 1.1 --loop epoll", env="conanrun")
+        urls = self.conf.get("user.libcurl:benchmark_urls", default={}, check_type=dict)
+        for http_version, url in urls.items():
+            if (http_version == "2" and not curl_options.with_nghttp2) or \
+               (http_version == "3" and not curl_options.with_http3):
+                self.output.warning(f"Skipping HTTP/{http_version} benchmark, not enabled in libcurl")
+                continue
+            self.run(f"{bench} --http {http_version} --insecure {url}", env="conanrun")
@@ -0,0 +1,431 @@
+/*
+ * Parallel transfer benchmark for the curl multi interface.
+ *
+ *   test_multi_bench [--http 1.1|2|3] [--loop poll|epoll] [--parallel N]
+ *                    [--transfers N] [--insecure] [URL]
+ *
+ * Without URL, a loopback HTTP/1.1 server serving a 1 MiB payload is started
+ * in-process (POSIX only). HTTP/2 and HTTP/3 need a local server such as
+ * nghttpx or h2o, passed as URL.
+ *
+ * "poll" drives the transfers with curl_multi_poll(), "epoll" (Linux only)
+ * with curl_multi_socket_action() and an epoll instance.
+ */
+#include <curl/curl.h>
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <arpa/inet.h>
+#include <netinet/in.h>
+#include <pthread.h>
+#include <signal.h>
+#include <stdint.h>
+#include <sys/socket.h>
+#include <time.h>
+#include <unistd.h>
+#define HAVE_LOCAL_SERVER 1
+#endif
+
+#ifdef __linux__
+#include <errno.h>
+#include <sys/epoll.h>
+#define HAVE_EPOLL 1
+#endif
+
+#define PAYLOAD_SIZE (1024 * 1024)
+
+struct bench {
+  CURLM *multi;
+  CURL **handles;
+  int parallel;
+  int transfers;
+  int started;
+  int completed;
+  int failed;
+  long http_version_used;
+  curl_off_t bytes;
+#ifdef HAVE_EPOLL
+  int epfd;
+  long timeout_ms;
+#endif
+};
+
+static double now_seconds(void)
+{
+#ifdef _WIN32
+  LARGE_INTEGER freq, counter;
+  QueryPerformanceFrequency(&freq);
+  QueryPerformanceCounter(&counter);
+  return (double)counter.QuadPart / (double)freq.QuadPart;
+#else
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+#endif
+}
+
+static size_t write_cb(char *ptr, size_t size, size_t nmemb, void *userdata)
+{
+  struct bench *b = (struct bench *)userdata;
+  (void)ptr;
+  b->bytes += (curl_off_t)(size * nmemb);
+  return size * nmemb;
+}
+
+#ifdef HAVE_LOCAL_SERVER
+static char *payload;
+
+static int send_all(int fd, const char *data, size_t len)
+{
+  while(len > 0) {
+    ssize_t n = send(fd, data, len, 0);
+    if(n <= 0)
+      return -1;
+    data += n;
+    len -= (size_t)n;
+  }
+  return 0;
+}
+
+static void *serve_connection(void *arg)
+{
+  int fd = (int)(intptr_t)arg;
+  char header[256];
+  char buf[8192];
+  size_t used = 0;
+  int header_len = snprintf(header, sizeof(header),
+                            "HTTP/1.1 200 OK\r\n"
+                            "Content-Type: application/octet-stream\r\n"
+                            "Content-Length: %d\r\n\r\n", PAYLOAD_SIZE);
+
+  for(;;) {
+    char *end;
+    ssize_t n = recv(fd, buf + used, sizeof(buf) - used - 1, 0);
+    if(n <= 0)
+      break;
+    used += (size_t)n;
+    buf[used] = '\0';
+    /* answer every complete request header, keep the connection alive */
+    while((end = strstr(buf, "\r\n\r\n")) != NULL) {
+      size_t consumed = (size_t)(end - buf) + 4;
+      if(send_all(fd, header, (size_t)header_len) ||
+         send_all(fd, payload, PAYLOAD_SIZE))
+        goto done;
+      memmove(buf, buf + consumed, used - consumed + 1);
+      used -= consumed;
+    }
+    if(used == sizeof(buf) - 1)
+      break;
+  }
+done:
+  close(fd);
+  return NULL;
+}
+
+static void *accept_loop(void *arg)
+{
+  int listen_fd = (int)(intptr_t)arg;
+  for(;;) {
+    pthread_t thread;
+    int fd = accept(listen_fd, NULL, NULL);
+    if(fd < 0)
+      continue;
+    if(pthread_create(&thread, NULL, serve_connection, (void *)(intptr_t)fd))
+      close(fd);
+    else
+      pthread_detach(thread);
+  }
+  return NULL;
+}
+
+static int start_local_server(char *url, size_t url_size)
+{
+  struct sockaddr_in addr;
+  socklen_t addr_len = sizeof(addr);
+  pthread_t thread;
+  int one = 1;
+  int fd = socket(AF_INET, SOCK_STREAM, 0);
+  if(fd < 0)
+    return -1;
+  /* clients closing early must not kill the benchmark */
+  signal(SIGPIPE, SIG_IGN);
+  setsockopt(fd, SOL_SOCKET, SO_REUSEADDR, &one, sizeof(one));
+  memset(&addr, 0, sizeof(addr));
+  addr.sin_family = AF_INET;
+  addr.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+  addr.sin_port = 0;
+  if(bind(fd, (struct sockaddr *)&addr, sizeof(addr)) ||
+     listen(fd, 128) ||
+     getsockname(fd, (struct sockaddr *)&addr, &addr_len)) {
+    close(fd);
+    return -1;
+  }
+  payload = malloc(PAYLOAD_SIZE);
+  if(!payload) {
+    close(fd);
+    return -1;
+  }
+  memset(payload, 'x', PAYLOAD_SIZE);
+  if(pthread_create(&thread, NULL, accept_loop, (void *)(intptr_t)fd)) {
+    close(fd);
+    return -1;
+  }
+  pthread_detach(thread);
+  snprintf(url, url_size, "http://127.0.0.1:%d/payload", ntohs(addr.sin_port));
+  return 0;
+}
+#endif
+
+/* collect finished transfers and restart their handles until all are done */
+static void process_done(struct bench *b)
+{
+  CURLMsg *msg;
+  int pending;
+  while((msg = curl_multi_info_read(b->multi, &pending)) != NULL) {
+    CURL *easy;
+    long code = 0;
+    if(msg->msg != CURLMSG_DONE)
+      continue;
+    easy = msg->easy_handle;
+    curl_easy_getinfo(easy, CURLINFO_RESPONSE_CODE, &code);
+    curl_easy_getinfo(easy, CURLINFO_HTTP_VERSION, &b->http_version_used);
+    if(msg->data.result != CURLE_OK || code != 200) {
+      fprintf(stderr, "transfer failed: %s (HTTP %ld)\n",
+              curl_easy_strerror(msg->data.result), code);
+      b->failed++;
+    }
+    b->completed++;
+    curl_multi_remove_handle(b->multi, easy);
+    if(b->started < b->transfers) {
+      b->started++;
+      curl_multi_add_handle(b->multi, easy);
+    }
+  }
+}
+
+static void run_poll_loop(struct bench *b)
+{
+  int running;
+  while(b->completed < b->transfers) {
+    curl_multi_perform(b->multi, &running);
+    process_done(b);
+    if(b->completed < b->transfers)
+      curl_multi_poll(b->multi, NULL, 0, 1000, NULL);
+  }
+}
+
+#ifdef HAVE_EPOLL
+static int socket_cb(CURL *easy, curl_socket_t s, int what, void *userp,
+                     void *socketp)
+{
+  struct bench *b = (struct bench *)userp;
+  struct epoll_event ev;
+  (void)easy;
+  (void)socketp;
+  if(what == CURL_POLL_REMOVE) {
+    epoll_ctl(b->epfd, EPOLL_CTL_DEL, s, NULL);
+    return 0;
+  }
+  memset(&ev, 0, sizeof(ev));
+  ev.events = ((what & CURL_POLL_IN) ? EPOLLIN : 0) |
+              ((what & CURL_POLL_OUT) ? EPOLLOUT : 0);
+  ev.data.fd = s;
+  if(epoll_ctl(b->epfd, EPOLL_CTL_MOD, s, &ev) && errno == ENOENT)
+    epoll_ctl(b->epfd, EPOLL_CTL_ADD, s, &ev);
+  return 0;
+}
+
+static int timer_cb(CURLM *multi, long timeout_ms, void *userp)
+{
+  struct bench *b = (struct bench *)userp;
+  (void)multi;
+  b->timeout_ms = timeout_ms;
+  return 0;
+}
+
+static void run_epoll_loop(struct bench *b)
+{
+  struct epoll_event events[64];
+  int running;
+  while(b->completed < b->transfers) {
+    int i;
+    int timeout = b->timeout_ms < 0 ? 1000 : (int)b->timeout_ms;
+    int n = epoll_wait(b->epfd, events, 64, timeout);
+    if(n <= 0) {
+      curl_multi_socket_action(b->multi, CURL_SOCKET_TIMEOUT, 0, &running);
+    }
+    for(i = 0; i < n; i++) {
+      int flags = 0;
+      if(events[i].events & EPOLLIN)
+        flags |= CURL_CSELECT_IN;
+      if(events[i].events & EPOLLOUT)
+        flags |= CURL_CSELECT_OUT;
+      if(events[i].events & (EPOLLERR | EPOLLHUP))
+        flags |= CURL_CSELECT_ERR;
+      curl_multi_socket_action(b->multi, events[i].data.fd, flags, &running);
+    }
+    process_done(b);
+  }
+}
+#endif
+
+static const char *http_version_name(long version)
+{
+  switch(version) {
+  case CURL_HTTP_VERSION_1_0: return "HTTP/1.0";
+  case CURL_HTTP_VERSION_1_1: return "HTTP/1.1";
+  case CURL_HTTP_VERSION_2_0: return "HTTP/2";
+  case CURL_HTTP_VERSION_3: return "HTTP/3";
+  default: return "unknown";
+  }
+}
+
+int main(int argc, char **argv)
+{
+  struct bench b;
+  char local_url[64];
+  const char *url = NULL;
+  const char *http = "1.1";
+  const char *loop = "poll";
+  long version = CURL_HTTP_VERSION_1_1;
+  int insecure = 0;
+  double start, elapsed;
+  int i;
+
+  memset(&b, 0, sizeof(b));
+  b.parallel = 16;
+  b.transfers = 256;
+
+  for(i = 1; i < argc; i++) {
+    if(!strcmp(argv[i], "--http") && i + 1 < argc)
+      http = argv[++i];
+    else if(!strcmp(argv[i], "--loop") && i + 1 < argc)
+      loop = argv[++i];
+    else if(!strcmp(argv[i], "--parallel") && i + 1 < argc)
+      b.parallel = atoi(argv[++i]);
+    else if(!strcmp(argv[i], "--transfers") && i + 1 < argc)
+      b.transfers = atoi(argv[++i]);
+    else if(!strcmp(argv[i], "--insecure"))
+      insecure = 1;
+    else
+      url = argv[i];
+  }
+  if(b.parallel <= 0 || b.transfers <= 0) {
+    fprintf(stderr, "--parallel and --transfers must be positive\n");
+    return 1;
+  }
+  if(b.parallel > b.transfers)
+    b.parallel = b.transfers;
+
+  if(!strcmp(http, "2"))
+    version = CURL_HTTP_VERSION_2TLS;
+  else if(!strcmp(http, "3"))
+    version = CURL_HTTP_VERSION_3ONLY;
+  else if(strcmp(http, "1.1")) {
+    fprintf(stderr, "unknown HTTP version: %s\n", http);
+    return 1;
+  }
+
+  if(curl_global_init(CURL_GLOBAL_DEFAULT) != CURLE_OK)
+    return 1;
+  {
+    curl_version_info_data *info = curl_version_info(CURLVERSION_NOW);
+    if((version == CURL_HTTP_VERSION_2TLS && !(info->features & CURL_VERSION_HTTP2)) ||
+       (version == CURL_HTTP_VERSION_3ONLY && !(info->features & CURL_VERSION_HTTP3))) {
+      fprintf(stderr, "libcurl %s was built without HTTP/%s support\n", info->version, http);
+      return 1;
+    }
+  }
+
+  if(!url) {
+#ifdef HAVE_LOCAL_SERVER
+    if(version != CURL_HTTP_VERSION_1_1) {
+      fprintf(stderr, "the built-in server only speaks HTTP/1.1, pass a URL\n");
+      return 1;
+    }
+    if(start_local_server(local_url, sizeof(local_url))) {
+      fprintf(stderr, "could not start the local server\n");
+      return 1;
+    }
+    url = local_url;
+#else
+    (void)local_url;
+    fprintf(stderr, "no built-in server on this platform, pass a URL\n");
+    return 1;
+#endif
+  }
+
+  b.multi = curl_multi_init();
+  curl_multi_setopt(b.multi, CURLMOPT_PIPELINING, CURLPIPE_MULTIPLEX);
+  if(!strcmp(loop, "epoll")) {
+#ifdef HAVE_EPOLL
+    b.epfd = epoll_create1(0);
+    b.timeout_ms = -1;
+    curl_multi_setopt(b.multi, CURLMOPT_SOCKETFUNCTION, socket_cb);
+    curl_multi_setopt(b.multi, CURLMOPT_SOCKETDATA, &b);
+    curl_multi_setopt(b.multi, CURLMOPT_TIMERFUNCTION, timer_cb);
+    curl_multi_setopt(b.multi, CURLMOPT_TIMERDATA, &b);
+#else
+    fprintf(stderr, "epoll loop is only available on Linux\n");
+    return 1;
+#endif
+  }
+  else if(strcmp(loop, "poll")) {
+    fprintf(stderr, "unknown loop: %s\n", loop);
+    return 1;
+  }
+
+  b.handles = calloc((size_t)b.parallel, sizeof(CURL *));
+  if(!b.handles)
+    return 1;
+  start = now_seconds();
+  for(i = 0; i < b.parallel; i++) {
+    CURL *easy = curl_easy_init();
+    curl_easy_setopt(easy, CURLOPT_URL, url);
+    curl_easy_setopt(easy, CURLOPT_HTTP_VERSION, version);
+    curl_easy_setopt(easy, CURLOPT_PIPEWAIT, 1L);
+    curl_easy_setopt(easy, CURLOPT_WRITEFUNCTION, write_cb);
+    curl_easy_setopt(easy, CURLOPT_WRITEDATA, &b);
+    if(insecure) {
+      curl_easy_setopt(easy, CURLOPT_SSL_VERIFYPEER, 0L);
+      curl_easy_setopt(easy, CURLOPT_SSL_VERIFYHOST, 0L);
+    }
+    b.handles[i] = easy;
+    b.started++;
+    curl_multi_add_handle(b.multi, easy);
+  }
+
+#ifdef HAVE_EPOLL
+  if(b.epfd) {
+    int running;
+    curl_multi_socket_action(b.multi, CURL_SOCKET_TIMEOUT, 0, &running);
+    run_epoll_loop(&b);
+  }
+  else
+#endif
+    run_poll_loop(&b);
+  elapsed = now_seconds() - start;
+
+  printf("%s %s loop: %d transfers, %d parallel, %" CURL_FORMAT_CURL_OFF_T " bytes in %.3f s\n",
+         http_version_name(b.http_version_used), loop, b.transfers, b.parallel,
+         b.bytes, elapsed);
+  printf("  %.1f MiB/s, %.1f transfers/s, %d failed\n",
+         (double)b.bytes / (1024.0 * 1024.0) / elapsed,
+         (double)b.transfers / elapsed, b.failed);
+
+  for(i = 0; i < b.parallel; i++)
+    curl_easy_cleanup(b.handles[i]);
+  free(b.handles);
+  curl_multi_cleanup(b.multi);
+#ifdef HAVE_EPOLL
+  if(b.epfd)
+    close(b.epfd);
+#endif
+  curl_global_cleanup();
+  return b.failed ? 1 : 0;
+}
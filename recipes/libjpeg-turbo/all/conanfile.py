@@ -32,6 +32,7 @@ class LibjpegTurboConan(ConanFile):
         "turbojpeg": [True, False],
         "java": [True, False],
         "enable12bit": [True, False],
+        "with_tjbench": [True, False],
     }
     default_options = {
         "shared": False,
@@ -45,6 +46,7 @@ class LibjpegTurboConan(ConanFile):
         "turbojpeg": True,
         "java": False,
         "enable12bit": False,
+        "with_tjbench": False,
     }
 
     def config_options(self):
@@ -63,6 +65,7 @@ class LibjpegTurboConan(ConanFile):
         if self.options.get_safe("enable12bit"):
             del self.options.java
             del self.options.turbojpeg
+            del self.options.with_tjbench
         if self.options.get_safe("enable12bit") or self.settings.os == "Emscripten":
             del self.options.SIMD
         if self.options.get_safe("enable12bit") or self.options.libjpeg7_compatibility or self.options.libjpeg8_compatibility:
@@ -79,6 +82,8 @@ class LibjpegTurboConan(ConanFile):
             raise ConanInvalidConfiguration("12-bit samples is not allowed with libjpeg v7/v8 API/ABI")
         if self.options.get_safe("java") and not self.options.shared:
             raise ConanInvalidConfiguration("java wrapper requires shared libjpeg-turbo")
+        if self.options.get_safe("with_tjbench") and not self.options.turbojpeg:
+            raise ConanInvalidConfiguration("with_tjbench requires turbojpeg")
         if self.options.shared and is_msvc(self) and is_msvc_static_runtime(self):
             raise ConanInvalidConfiguration(f"{self.ref} shared can't be built with static vc runtime")
 
@@ -89,6 +94,14 @@ class LibjpegTurboConan(ConanFile):
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
+    @property
+    def _simd_available(self):
+        # architectures with SIMD extensions in libjpeg-turbo (simd/CMakeLists.txt)
+        arch = str(self.settings.arch)
+        return self.options.get_safe("SIMD", False) and (
+            arch in ["x86", "x86_64", "mips", "mips64"] or arch.startswith(("armv7", "armv8", "ppc"))
+        )
+
     @property
     def _is_arithmetic_encoding_enabled(self):
         return self.options.get_safe("arithmetic_encoder", False) or \
@@ -107,13 +120,15 @@ class LibjpegTurboConan(ConanFile):
         tc.variables["ENABLE_STATIC"] = not self.options.shared
         tc.variables["ENABLE_SHARED"] = self.options.shared
         tc.variables["WITH_SIMD"] = self.options.get_safe("SIMD", False)
+        # fail instead of silently falling back to C code (e.g. nasm missing or too old)
+        tc.variables["REQUIRE_SIMD"] = self._simd_available
         tc.variables["WITH_ARITH_ENC"] = self._is_arithmetic_encoding_enabled
         tc.variables["WITH_ARITH_DEC"] = self._is_arithmetic_decoding_enabled
         tc.variables["WITH_JPEG7"] = self.options.libjpeg7_compatibility
         tc.variables["WITH_JPEG8"] = self.options.libjpeg8_compatibility
         tc.variables["WITH_TURBOJPEG"] = self.options.get_safe("turbojpeg", False)
         tc.variables["WITH_JAVA"] = self.options.get_safe("java", False)
-        tc.cache_variables["WITH_TOOLS"] = False
+        tc.cache_variables["WITH_TOOLS"] = self.options.get_safe("with_tjbench", False)
         if Version(self.version) < "3.0.0":
             tc.variables["WITH_MEM_SRCDST"] = self.options.get_safe("mem_src_dst", False)
             tc.variables["WITH_12BIT"] = self.options.enable12bit
@@ -152,13 +167,18 @@ class LibjpegTurboConan(ConanFile):
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
         rmdir(self, os.path.join(self.package_folder, "doc"))
         # remove binaries and pdb files
-        for pattern_to_remove in ["cjpeg*", "djpeg*", "jpegtran*", "tjbench*", "wrjpgcom*", "rdjpgcom*", "*.pdb"]:
+        patterns_to_remove = ["cjpeg*", "djpeg*", "jpegtran*", "wrjpgcom*", "rdjpgcom*", "tjexample*", "*.pdb"]
+        if not self.options.get_safe("with_tjbench"):
+            patterns_to_remove.append("tjbench*")
+        for pattern_to_remove in patterns_to_remove:
             rm(self, pattern_to_remove, os.path.join(self.package_folder, "bin"))
 
     def package_info(self):
         self.cpp_info.set_property("cmake_find_mode", "both")
         self.cpp_info.set_property("cmake_module_file_name", "JPEG")
         self.cpp_info.set_property("cmake_file_name", "libjpeg-turbo")
+        # SIMD extensions are guaranteed to be linked in when this is True (REQUIRE_SIMD)
+        self.conf_info.define("user.libjpeg-turbo:simd", bool(self._simd_available))
 
         cmake_target_suffix = "-static" if not self.options.shared else ""
         lib_suffix = "-static" if is_msvc(self) and not self.options.shared else ""
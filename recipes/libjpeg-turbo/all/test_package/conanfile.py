@@ -21,6 +21,10 @@ class TestPackageConan(ConanFile):
         cmake.build()
 
     def test(self):
+        with_tjbench = self.dependencies[self.tested_reference_str].options.get_safe("with_tjbench")
+        if with_tjbench:
+            ext = ".exe" if self.settings.os == "Windows" else ""
+            assert os.path.exists(os.path.join(self.dependencies[self.tested_reference_str].cpp_info.bindir, f"tjbench{ext}"))
         if can_run(self):
             bin_path = os.path.join(self.cpp.build.bindirs[0], "test_package")
             self.run(bin_path, env="conanrun")
@@ -7,6 +7,7 @@ from conan.tools.apple import is_apple_os
 from conan.tools.build import check_min_cppstd, cross_building
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.files import save, copy, get, rmdir, apply_conandata_patches, export_conandata_patches
+from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 
 required_conan_version = ">=2.0.9"
@@ -28,6 +29,24 @@ class LlamaCppConan(ConanFile):
         "with_examples": [True, False],
         "with_cuda": [True, False],
         "with_curl": [True, False],
+        "with_openblas": [True, False],
+        "with_backend_dl": [True, False],
+        "with_cpu_all_variants": [True, False],
+        # Tune the CPU backend for the build machine (GGML_NATIVE, off when cross-building),
+        # set to False to pick the instruction sets with the options below
+        "native": [True, False],
+        # x86 instruction sets of the CPU backend
+        "with_sse42": [True, False],
+        "with_avx": [True, False],
+        "with_avx2": [True, False],
+        "with_avx512": [True, False],
+        "with_f16c": [True, False],
+        "with_fma": [True, False],
+        "with_amx": [True, False],
+        # armv8 extensions of the CPU backend
+        "with_dotprod": [True, False],
+        "with_i8mm": [True, False],
+        "with_sve": [True, False],
     }
     default_options = {
         "shared": False,
@@ -35,9 +54,25 @@ class LlamaCppConan(ConanFile):
         "with_examples": False,
         "with_cuda": False,
         "with_curl": False,
+        "with_openblas": False,
+        "with_backend_dl": False,
+        "with_cpu_all_variants": False,
+        "native": True,
+        # Same instruction sets as a non-native upstream build
+        "with_sse42": True,
+        "with_avx": True,
+        "with_avx2": True,
+        "with_avx512": False,
+        "with_f16c": True,
+        "with_fma": True,
+        "with_amx": False,
+        "with_dotprod": False,
+        "with_i8mm": False,
+        "with_sve": False,
     }
 
-    implements = ["auto_shared_fpic"]
+    _x86_options = ("with_sse42", "with_avx", "with_avx2", "with_avx512", "with_f16c", "with_fma", "with_amx")
+    _armv8_options = ("with_dotprod", "with_i8mm", "with_sve")
 
     @property
     def _is_new_llama(self):
@@ -59,11 +94,51 @@ class LlamaCppConan(ConanFile):
             endif()
         """)
 
+    @property
+    def _supports_cpu_all_variants(self):
+        if self.settings.arch in ("x86", "x86_64"):
+            return True
+        # armv8 variants were added after b4570
+        return (self.settings.arch == "armv8" and Version(self.version) >= "b6565"
+                and self.settings.os in ("Linux", "Android", "Macos"))
+
     def export_sources(self):
         export_conandata_patches(self)
 
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+        if self.settings.arch not in ("x86", "x86_64"):
+            for option in self._x86_options:
+                self.options.rm_safe(option)
+        elif is_msvc(self) or Version(self.version) < "b4079":
+            # AMX is neither supported by msvc nor known to older versions
+            del self.options.with_amx
+        # GGML_CPU_ARM_ARCH, GGML_BACKEND_DL and GGML_CPU_ALL_VARIANTS need the new ggml layout
+        if self.settings.arch != "armv8" or not self._is_new_llama:
+            for option in self._armv8_options:
+                self.options.rm_safe(option)
+        if not self._is_new_llama:
+            del self.options.with_backend_dl
+        if not self._is_new_llama or not self._supports_cpu_all_variants:
+            del self.options.with_cpu_all_variants
+
+    def configure(self):
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
+        if self.options.get_safe("with_cpu_all_variants"):
+            # Every variant fixes its own instruction sets
+            self.options.rm_safe("native")
+        if self.options.get_safe("with_cpu_all_variants") or self.options.get_safe("native"):
+            for option in self._x86_options + self._armv8_options:
+                self.options.rm_safe(option)
+
     def validate(self):
         check_min_cppstd(self, 17 if self._is_new_llama else 11)
+        if self.options.get_safe("with_backend_dl") and not self.options.shared:
+            raise ConanInvalidConfiguration(f"{self.ref} with_backend_dl=True requires shared=True")
+        if self.options.get_safe("with_cpu_all_variants") and not self.options.get_safe("with_backend_dl"):
+            raise ConanInvalidConfiguration(f"{self.ref} with_cpu_all_variants=True requires with_backend_dl=True")
 
     def validate_build(self):
         if self._is_new_llama and self.settings.compiler == "msvc" and "arm" in self.settings.arch:
@@ -75,6 +150,8 @@ class LlamaCppConan(ConanFile):
     def requirements(self):
         if self.options.with_curl:
             self.requires("libcurl/[>=7.78 <9]")
+        if self.options.with_openblas:
+            self.requires("openblas/[>=0.3.24 <1]")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -89,9 +166,37 @@ class LlamaCppConan(ConanFile):
         tc.variables["LLAMA_BUILD_TESTS"] = False
         tc.variables["LLAMA_BUILD_EXAMPLES"] = self.options.get_safe("with_examples")
         tc.variables["LLAMA_CURL"] = self.options.get_safe("with_curl")
-        if cross_building(self):
-            tc.variables["LLAMA_NATIVE"] = False
-            tc.variables["GGML_NATIVE_DEFAULT"] = False
+        if self.options.get_safe("native"):
+            if cross_building(self):
+                tc.variables["LLAMA_NATIVE"] = False
+                tc.variables["GGML_NATIVE_DEFAULT"] = False
+        else:
+            # The CPU features are selected by the options below
+            tc.variables["GGML_NATIVE"] = False
+        if "with_avx" in self.options:
+            tc.variables["GGML_SSE42"] = self.options.with_sse42
+            tc.variables["GGML_AVX"] = self.options.with_avx
+            tc.variables["GGML_AVX2"] = self.options.with_avx2
+            tc.variables["GGML_BMI2"] = self.options.with_avx2
+            tc.variables["GGML_AVX512"] = self.options.with_avx512
+            tc.variables["GGML_F16C"] = self.options.with_f16c
+            tc.variables["GGML_FMA"] = self.options.with_fma
+            if "with_amx" in self.options:
+                tc.variables["GGML_AMX_TILE"] = self.options.with_amx
+                tc.variables["GGML_AMX_INT8"] = self.options.with_amx
+        if "with_dotprod" in self.options:
+            extensions = [ext for ext in ("dotprod", "i8mm", "sve") if self.options.get_safe(f"with_{ext}")]
+            if extensions:
+                tc.variables["GGML_CPU_ARM_ARCH"] = "+".join(["armv8.2-a"] + extensions)
+        if self._is_new_llama:
+            tc.variables["GGML_BACKEND_DL"] = self.options.with_backend_dl
+            tc.variables["GGML_CPU_ALL_VARIANTS"] = self.options.get_safe("with_cpu_all_variants", False)
+        if self.options.with_openblas:
+            tc.variables["GGML_BLAS"] = True
+            tc.variables["GGML_BLAS_VENDOR"] = "OpenBLAS"
+            # ggml only looks for cblas.h through pkg-config when this is empty
+            openblas_includedirs = self.dependencies["openblas"].cpp_info.aggregated_components().includedirs
+            tc.variables["BLAS_INCLUDE_DIRS"] = ";".join(d.replace("\\", "/") for d in openblas_includedirs)
 
         tc.variables["GGML_BUILD_TESTS"] = False
         # Follow with_examples when newer versions can compile examples,
@@ -119,13 +224,19 @@ class LlamaCppConan(ConanFile):
         copy(self, "*common*.so", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
         copy(self, "*common*.dylib", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
         copy(self, "*common*.a", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
+        if self.options.get_safe("with_backend_dl"):
+            # Backend modules are loaded at runtime, older versions don't install them
+            for backend in self._get_backends():
+                for pattern in (f"*ggml-{backend}*.so", f"*ggml-{backend}*.dll"):
+                    copy(self, pattern, os.path.join(self.build_folder, "bin"), os.path.join(self.package_folder, "bin"), keep_path=False)
         if self.options.with_cuda and not self.options.shared:
             save(self, os.path.join(self.package_folder, "lib", "cmake", "llama-cpp-cuda-static.cmake"), self._cuda_build_module)
 
     def _get_backends(self):
         results = ["cpu"]
-        if is_apple_os(self):
+        if is_apple_os(self) or self.options.with_openblas:
             results.append("blas")
+        if is_apple_os(self):
             results.append("metal")
         if self.options.with_cuda:
             results.append("cuda")
@@ -175,6 +286,17 @@ class LlamaCppConan(ConanFile):
                 self.cpp_info.components["ggml-base"].defines.append("GGML_SHARED")
                 self.cpp_info.components["ggml"].defines.append("GGML_SHARED")
 
+            if self.options.with_backend_dl:
+                # The backends are modules in bin/, found by ggml_backend_load_all() next to the
+                # executable or by ggml_backend_load_all_from_path(), so nothing links against them.
+                # Only the BLAS module needs OpenBLAS, this component just carries it to the runtime environment
+                if self.options.with_openblas:
+                    self.cpp_info.components["ggml-blas"].libs = []
+                    self.cpp_info.components["ggml-blas"].includedirs = []
+                    self.cpp_info.components["ggml-blas"].set_property("cmake_target_name", "ggml-blas")
+                    self.cpp_info.components["ggml-blas"].requires = ["openblas::openblas"]
+                return
+
             backends = self._get_backends()
             for backend in backends:
                 self.cpp_info.components[f"ggml-{backend}"].libs = [f"ggml-{backend}"]
@@ -185,8 +307,12 @@ class LlamaCppConan(ConanFile):
                 self.cpp_info.components["ggml"].defines.append(f"GGML_USE_{backend.upper()}")
                 self.cpp_info.components["ggml"].requires.append(f"ggml-{backend}")
 
-            if is_apple_os(self):
-                if "blas" in backends:
-                    self.cpp_info.components["ggml-blas"].frameworks.append("Accelerate")
-                if "metal" in backends:
-                    self.cpp_info.components["ggml-metal"].frameworks.extend(["Metal", "MetalKit", "Foundation", "CoreFoundation"])
+            if self.options.with_openblas:
+                self.cpp_info.components["ggml-blas"].requires.append("openblas::openblas")
+            elif is_apple_os(self) and "blas" in backends:
+                self.cpp_info.components["ggml-blas"].frameworks.append("Accelerate")
+            if is_apple_os(self) and "metal" in backends:
+                self.cpp_info.components["ggml-metal"].frameworks.extend(["Metal", "MetalKit", "Foundation", "CoreFoundation"])
+        elif self.options.with_openblas:
+            # Older versions build every backend into ggml
+            self.cpp_info.components["ggml"].requires.append("openblas::openblas")
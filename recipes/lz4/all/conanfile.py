@@ -21,10 +21,14 @@ class LZ4Conan(ConanFile):
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
+        "build_programs": [True, False],
+        "multithreaded": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
+        "build_programs": False,
+        "multithreaded": True,
     }
 
     def export_sources(self):
@@ -33,10 +37,16 @@ class LZ4Conan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if Version(self.version) < "1.10.0":
+            # Multithreaded compression was introduced in the lz4 CLI 1.10.0
+            del self.options.multithreaded
 
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        if not self.options.build_programs:
+            # liblz4 itself is single-threaded, only the CLI uses threads
+            self.options.rm_safe("multithreaded")
         self.settings.rm_safe("compiler.cppstd")
         self.settings.rm_safe("compiler.libcxx")
 
@@ -49,7 +59,7 @@ class LZ4Conan(ConanFile):
 
     def generate(self):
         tc = CMakeToolchain(self)
-        tc.variables["LZ4_BUILD_CLI"] = False
+        tc.variables["LZ4_BUILD_CLI"] = self.options.build_programs
         if Version(self.version) < "1.10.0":
             tc.variables["LZ4_BUILD_LEGACY_LZ4C"] = False
         tc.variables["LZ4_BUNDLED_MODE"] = False
@@ -60,6 +70,11 @@ class LZ4Conan(ConanFile):
         tc.cache_variables["CMAKE_POLICY_DEFAULT_CMP0077"] = "NEW"
         if Version(self.version) < "1.10.0":
             tc.cache_variables["CMAKE_POLICY_VERSION_MINIMUM"] = "3.5" # CMake 4 support
+        if self.options.build_programs and Version(self.version) >= "1.10.0":
+            # lz4io only enables threads by default on Windows, pthread support is not detected
+            tc.preprocessor_definitions["LZ4IO_MULTITHREAD"] = 1 if self.options.multithreaded else 0
+            if self.options.multithreaded and self.settings.os != "Windows":
+                tc.extra_exelinkflags.append("-pthread")
         tc.generate()
 
     @property
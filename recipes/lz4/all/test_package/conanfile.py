@@ -30,3 +30,8 @@ class TestPackageConan(ConanFile):
         if can_run(self):
             bin_path = os.path.join(self.cpp.build.bindirs[0], "test_package")
             self.run(bin_path, env="conanrun")
+            lz4 = self.dependencies["lz4"]
+            if lz4.options.build_programs:
+                lz4_bin = os.path.join(lz4.cpp_info.bindir, "lz4")
+                # Built-in benchmark on a synthetic sample, compression level 1, for one second
+                self.run(f"{lz4_bin} -b1 -i1", env="conanrun")
@@ -1,11 +1,12 @@
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
-from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy, rm, rmdir, replace_in_file, collect_libs
+from conan.tools.files import apply_conandata_patches, export_conandata_patches, get, copy, load, rm, rmdir, replace_in_file, save, collect_libs
 from conan.tools.microsoft import is_msvc, is_msvc_static_runtime, VCVars
 from conan.tools.env import VirtualBuildEnv
 from conan.tools.scm import Version
 import os
+import re
 import shutil
 
 required_conan_version = ">=2"
@@ -29,6 +30,12 @@ class MimallocConan(ConanFile):
         "single_object": [True, False],
         "guarded": [True, False],
         "win_redirect": [True, False],
+        "stat_level": [None, 1, 2],
+        "opt_arch": [True, False],
+        "arena_reserve": [None, "ANY"],
+        "allow_large_os_pages": [None, True, False],
+        "reserve_huge_os_pages": [None, "ANY"],
+        "eager_commit_delay": [None, "ANY"],
     }
     default_options = {
         "shared": False,
@@ -39,6 +46,21 @@ class MimallocConan(ConanFile):
         "single_object": False,
         "guarded": False,
         "win_redirect": False,
+        "stat_level": None,
+        "opt_arch": False,
+        "arena_reserve": None,
+        "allow_large_os_pages": None,
+        "reserve_huge_os_pages": None,
+        "eager_commit_delay": None,
+    }
+    options_description = {
+        "stat_level": "Collect allocation statistics (MI_STAT) in release builds too: 1 for the main counters, "
+                      "2 for detailed per-size statistics",
+        "opt_arch": "Optimize for the target architecture, e.g. with armv8.1 atomics on arm64 (MI_OPT_ARCH)",
+        "arena_reserve": "Default of the arena_reserve option, in KiB",
+        "allow_large_os_pages": "Default of the allow_large_os_pages option",
+        "reserve_huge_os_pages": "Default of the reserve_huge_os_pages option, in 1GiB pages",
+        "eager_commit_delay": "Default of the eager_commit_delay option, in segments",
     }
 
     def export_sources(self):
@@ -57,6 +79,10 @@ class MimallocConan(ConanFile):
             del self.options.inject
         if Version(self.version) < "2.1.9":
             del self.options.guarded
+            del self.options.opt_arch
+        # mi_option_arena_reserve was added in 1.8.0 and 2.1.0
+        if Version(self.version) < "1.8.0" or "2.0.0" <= Version(self.version) < "2.1.0":
+            del self.options.arena_reserve
 
     def configure(self):
         if self.options.shared:
@@ -111,6 +137,11 @@ class MimallocConan(ConanFile):
            self.options.get_safe("inject"):
             raise ConanInvalidConfiguration("Single object is incompatible with library injection")
 
+        for option in ["arena_reserve", "reserve_huge_os_pages", "eager_commit_delay"]:
+            value = str(self.options.get_safe(option))
+            if value != "None" and not value.isdigit():
+                raise ConanInvalidConfiguration(f"{option} must be a non-negative integer, got '{value}'")
+
     def build_requirements(self):
         self.tool_requires("cmake/[>=3.18 <4]")
 
@@ -128,8 +159,17 @@ class MimallocConan(ConanFile):
         tc.variables["MI_WIN_REDIRECT"] = "ON" if self.options.get_safe("win_redirect") else "OFF"
         tc.variables["MI_INSTALL_TOPLEVEL"] = "ON"
         tc.variables["MI_GUARDED"] = self.options.get_safe("guarded", False)
+        if self.options.get_safe("opt_arch"):
+            tc.variables["MI_OPT_ARCH"] = True
+        if self.options.stat_level:
+            tc.preprocessor_definitions["MI_STAT"] = self.options.stat_level
         if Version(self.version) <= "1.7.6":
             tc.cache_variables["CMAKE_POLICY_VERSION_MINIMUM"] = "3.5" # CMake 4 support
+        if self._option_defaults:
+            macros = self._option_default_macros
+            for name, value in self._option_defaults.items():
+                if name in macros:
+                    tc.preprocessor_definitions[macros[name]] = value
         tc.generate()
         venv = VirtualBuildEnv(self)
         venv.generate(scope="build")
@@ -138,8 +178,50 @@ class MimallocConan(ConanFile):
             vcvars = VCVars(self)
             vcvars.generate()
 
+    @property
+    def _option_defaults(self):
+        # Names as in the options table of src/options.c, large_os_pages is the legacy name of allow_large_os_pages
+        defaults = {
+            "arena_reserve": str(self.options.get_safe("arena_reserve")),
+            "large_os_pages": {"True": "1", "False": "0"}.get(str(self.options.allow_large_os_pages), "None"),
+            "reserve_huge_os_pages": str(self.options.reserve_huge_os_pages),
+            "eager_commit_delay": str(self.options.eager_commit_delay),
+        }
+        return {name: value for name, value in defaults.items() if value != "None"}
+
+    @property
+    def _option_default_macros(self):
+        # Recent releases read some defaults from MI_DEFAULT_<OPTION> macros (#ifndef guarded in src/options.c),
+        # only the options whose macro exists in this source tree are listed.
+        macros = {
+            "arena_reserve": "MI_DEFAULT_ARENA_RESERVE",
+            "large_os_pages": "MI_DEFAULT_ALLOW_LARGE_OS_PAGES",
+            "reserve_huge_os_pages": "MI_DEFAULT_RESERVE_HUGE_OS_PAGES",
+        }
+        options_c = load(self, os.path.join(self.source_folder, "src", "options.c"))
+        return {name: macro for name, macro in macros.items() if re.search(rf"#\s*ifndef\s+{macro}\b", options_c)}
+
+    def _patch_option_defaults(self):
+        # Environment variables (MIMALLOC_<OPTION>) still override these defaults at runtime.
+        # Defaults with an MI_DEFAULT_<OPTION> macro are set in generate() instead.
+        # Entries of the options table look like { 1, UNINIT, MI_OPTION(eager_commit_delay) } up to 2.1.x,
+        # MI_OPTION_LEGACY(new_name,old_name) since 1.8.0/2.1.0, and MI_OPTION_UNINIT since 2.2.0.
+        # Some entries are repeated in #if branches (e.g. arena_reserve on 32-bit), all of them are replaced.
+        options_c = os.path.join(self.source_folder, "src", "options.c")
+        content = load(self, options_c)
+        macros = self._option_default_macros
+        for name, value in self._option_defaults.items():
+            if name in macros:
+                continue
+            pattern = r"(\{\s*)[^{},]+?(\s*,\s*(?:MI_OPTION_)?UNINIT\s*,\s*MI_OPTION(?:_LEGACY)?\((?:\w+\s*,\s*)?" + name + r"\s*[,)])"
+            content, count = re.subn(pattern, rf"\g<1>{value}\g<2>", content)
+            if count == 0:
+                raise ConanException(f"Could not set the default of the {name} option in {options_c}")
+        save(self, options_c, content)
+
     def build(self):
         apply_conandata_patches(self)
+        self._patch_option_defaults()
         if is_msvc(self) and self.settings.arch == "x86" and self.options.shared:
             replace_in_file(self, os.path.join(self.source_folder, "CMakeLists.txt"),
                             "mimalloc-redirect.lib",
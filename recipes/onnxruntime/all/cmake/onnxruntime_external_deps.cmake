@@ -93,6 +93,10 @@ endif()
 
 if (onnxruntime_USE_MIMALLOC)
   find_package(mimalloc REQUIRED CONFIG)
+  # upstream links the mimalloc-static target of its bundled copy
+  if(TARGET mimalloc AND NOT TARGET mimalloc-static)
+    add_library(mimalloc-static ALIAS mimalloc)
+  endif()
   add_definitions(-DUSE_MIMALLOC)
 endif()
 
@@ -1,8 +1,10 @@
+import glob
+import hashlib
 import os
 import sys
 
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import check_min_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
@@ -26,12 +28,25 @@ class OnnxRuntimeConan(ConanFile):
         "fPIC": [True, False],
         "with_xnnpack": [True, False],
         "with_cuda": [True, False],
+        # oneDNN is not available as a Conan package, upstream downloads and builds its pinned
+        # version with ExternalProject, so the build needs network access
+        "with_openvino": [True, False],
+        "with_mimalloc": [True, False],
+        "enable_lto": [True, False],
+        "minimal_build": [True, False],
+        # Absolute path to an operator config file, as generated by tools/python/create_reduced_build_config.py
+        "reduced_ops_config": [None, "ANY"],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "with_xnnpack": False,
         "with_cuda": False,
+        "with_openvino": False,
+        "with_mimalloc": False,
+        "enable_lto": False,
+        "minimal_build": False,
+        "reduced_ops_config": None,
     }
     short_paths = True
 
@@ -52,9 +67,13 @@ class OnnxRuntimeConan(ConanFile):
 
     def requirements(self):
         required_onnx_version = self.conan_data["onnx_version_map"][self.version]
-        self.requires(f"onnx/{required_onnx_version}")
+        # Only with with_openvino: the openvino recipe pins onnx and protobuf to versions this onnxruntime
+        # cannot build with, which would otherwise be a graph conflict. Forcing ours makes openvino's ONNX
+        # frontend build against the same onnx/protobuf, both being loaded in the same process by the EP.
+        # Graphs without with_openvino are not affected.
+        self.requires(f"onnx/{required_onnx_version}", force=bool(self.options.with_openvino))
         self.requires("abseil/[>=20240116.1 <=20250814.0]")
-        self.requires("protobuf/[>=3.21.12 <7]")
+        self.requires("protobuf/[>=3.21.12 <7]", force=bool(self.options.with_openvino))
         self.requires("date/[>=3.0.1 <3.1]")
         self.requires("re2/[>=20231101]")
         self.requires("flatbuffers/23.5.26")
@@ -72,6 +91,10 @@ class OnnxRuntimeConan(ConanFile):
             self.requires("pthreadpool/cci.20231129")
         if self.options.with_cuda:
             self.requires("cutlass/3.5.0")
+        if self.options.with_openvino:
+            self.requires("openvino/[>=2024.6.0 <2026]")
+        if self.options.with_mimalloc:
+            self.requires("mimalloc/[>=2.1.7 <3]")
         self.requires("cpuinfo/[>=cci.20250110]")
 
     def validate(self):
@@ -85,10 +108,27 @@ class OnnxRuntimeConan(ConanFile):
             # Commented here: https://github.com/onnx/onnx/pull/7505#issuecomment-3601468150
             raise ConanInvalidConfiguration("There are link errors using 'onnx/*:shared=True',"
                                             " use '-o onnx/*:shared=False' instead.")
+        if self.options.with_openvino and not self.options.shared:
+            # The EP is built as an onnxruntime_providers_openvino module on top of
+            # onnxruntime_providers_shared, which are loaded by the shared onnxruntime library
+            raise ConanInvalidConfiguration(f"{self.ref} with_openvino=True requires shared=True")
+        if self.options.with_openvino and not self.dependencies["openvino"].options.enable_onnx_frontend:
+            raise ConanInvalidConfiguration(
+                f"{self.ref} requires openvino compiled with `-o openvino/*:enable_onnx_frontend=True`."
+            )
 
     def validate_build(self):
         if self.settings.os == "Windows" and self.dependencies["abseil"].options.shared:
             raise ConanInvalidConfiguration("Using abseil shared on Windows leads to link errors.")
+        if self.options.reduced_ops_config and not os.path.isfile(str(self.options.reduced_ops_config)):
+            raise ConanInvalidConfiguration(f"reduced_ops_config file '{self.options.reduced_ops_config}' does not exist")
+
+    def package_id(self):
+        # The content of the operator config defines the binary, not where it was stored
+        config = str(self.info.options.reduced_ops_config)
+        if self.info.options.reduced_ops_config and os.path.isfile(config):
+            with open(config, "rb") as f:
+                self.info.options.reduced_ops_config = hashlib.sha256(f.read()).hexdigest()
 
     def build_requirements(self):
         # Required by upstream https://github.com/microsoft/onnxruntime/blob/v1.16.1/cmake/CMakeLists.txt#L5
@@ -108,6 +148,11 @@ class OnnxRuntimeConan(ConanFile):
         tc.variables["onnxruntime_USE_XNNPACK"] = self.options.with_xnnpack
 
         tc.variables["onnxruntime_USE_CUDA"] = self.options.with_cuda
+        tc.variables["onnxruntime_USE_OPENVINO"] = self.options.with_openvino
+        tc.variables["onnxruntime_USE_MIMALLOC"] = self.options.with_mimalloc
+        tc.variables["onnxruntime_ENABLE_LTO"] = self.options.enable_lto
+        tc.variables["onnxruntime_MINIMAL_BUILD"] = self.options.minimal_build
+        tc.variables["onnxruntime_REDUCED_OPS_BUILD"] = bool(self.options.reduced_ops_config)
         tc.variables["onnxruntime_BUILD_UNIT_TESTS"] = False
         tc.variables["onnxruntime_DISABLE_CONTRIB_OPS"] = False
         tc.variables["onnxruntime_USE_FLASH_ATTENTION"] = False
@@ -141,7 +186,16 @@ class OnnxRuntimeConan(ConanFile):
         replace_in_file(self, os.path.join(self.source_folder, "cmake", "CMakeLists.txt"),
                         "if (Git_FOUND)", "if (FALSE)")
 
+    def _reduce_op_kernels(self):
+        # Writes the kernel registrations limited to the configured operators to
+        # <build>/op_reduction.generated, which onnxruntime_REDUCED_OPS_BUILD compiles instead
+        script = os.path.join(self.source_folder, "tools", "ci_build", "reduce_op_kernels.py")
+        self.run(f'"{sys.executable}" "{script}" --cmake_build_dir "{self.build_folder}" '
+                 f'"{self.options.reduced_ops_config}"')
+
     def build(self):
+        if self.options.reduced_ops_config:
+            self._reduce_op_kernels()
         cmake = CMake(self)
         cmake.configure(build_script_folder="cmake", cli_args=["--compile-no-warning-as-error"])
         cmake.build()
@@ -152,27 +206,49 @@ class OnnxRuntimeConan(ConanFile):
         cmake.install()
         rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
+        self._check_packaged_libs()
+
+    @property
+    def _static_libs(self):
+        # order is important
+        # https://github.com/microsoft/onnxruntime/blob/v1.23.2/cmake/onnxruntime.cmake#L240
+        # minimal_build keeps the same set of internal libraries, each built from fewer sources
+        onnxruntime_libs = [
+            "session",
+            *(["providers_xnnpack"] if self.options.with_xnnpack else []),
+            "optimizer",
+            "providers",
+            "lora",
+            "framework",
+            "graph",
+            "util",
+            "mlas",
+            "common",
+            "flatbuffers",
+        ]
+        return [f"onnxruntime_{lib}" for lib in onnxruntime_libs]
+
+    def _check_packaged_libs(self):
+        def packaged(name):
+            return any(glob.glob(os.path.join(self.package_folder, folder, f"*{name}.*"))
+                       for folder in ("lib", "bin"))
+
+        if self.options.shared:
+            # Execution providers built as modules, loaded at runtime by onnxruntime
+            expected = []
+            if self.options.with_openvino:
+                expected = ["onnxruntime_providers_openvino", "onnxruntime_providers_shared"]
+        else:
+            expected = self._static_libs
+        missing = [name for name in expected if not packaged(name)]
+        if missing:
+            raise ConanException(f"{self.ref}: expected libraries were not installed: {', '.join(missing)}")
 
     def package_info(self):
         if self.options.shared:
             self.cpp_info.libs = ["onnxruntime"]
         else:
-            # order is important
-            # https://github.com/microsoft/onnxruntime/blob/v1.23.2/cmake/onnxruntime.cmake#L240
-            onnxruntime_libs = [
-                "session",
-                *(["providers_xnnpack"] if self.options.with_xnnpack else []),
-                "optimizer",
-                "providers",
-                "lora",
-                "framework",
-                "graph",
-                "util",
-                "mlas",
-                "common",
-                "flatbuffers",
-            ]
-            self.cpp_info.libs = [f"onnxruntime_{lib}" for lib in onnxruntime_libs]
+            self.cpp_info.libs = self._static_libs
 
         self.cpp_info.includedirs.append("include/onnxruntime")
         if not self.options.shared:
@@ -2,7 +2,7 @@ from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.apple import fix_apple_shared_install_name
 from conan.tools.build import cross_building
-from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
+from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.files import copy, get, rmdir
 from conan.tools.microsoft import is_msvc_static_runtime, is_msvc
 from conan.tools.scm import Version
@@ -73,25 +73,35 @@ class OpenblasConan(ConanFile):
         "fPIC": [True, False],
         "build_lapack": [True, False],
         "build_relapack": [True, False],
-        "use_thread": [True, False],
+        "threading": ["pthreads", "openmp", "serial"],
+        "num_threads": [None, "ANY"],
+        "buffer_size": [None, "ANY"],
         "use_locking": [True, False],
         "dynamic_arch": [True, False],
-        "target": [None] + available_openblas_targets
+        "target": [None] + available_openblas_targets,
+        # TODO: deprecated options to remove in few months
+        "use_thread": [True, False, "deprecated"],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "build_lapack": True,
         "build_relapack": False,
-        "use_thread": True,
+        "threading": "pthreads",
+        "num_threads": None,
+        "buffer_size": None,
         "use_locking": True,
         "dynamic_arch": False,
         "target": None,
+        "use_thread": "deprecated",
     }
     options_description = {
         "build_lapack": "Build LAPACK and LAPACKE",
         "build_relapack": "Build with ReLAPACK (recursive implementation of several LAPACK functions on top of standard LAPACK)",
-        "use_thread": "Enable threads support",
+        "threading": "Threading model: pthreads, openmp or serial (single-threaded)",
+        "num_threads": "Maximum number of threads OpenBLAS can use (NUM_THREADS), defaults to the number of cores of the build machine",
+        "buffer_size": "Size of the per-thread buffer as a power of two (BUFFERSIZE)",
+        "use_thread": "Deprecated, use threading option instead",
         "use_locking": "Use locks even in single-threaded builds to make them callable from multiple threads",
         "dynamic_arch": "Include support for multiple CPU targets, with automatic selection at runtime (x86/x86_64, aarch64 or ppc only)",
         "target": "OpenBLAS TARGET variable (see TargetList.txt)",
@@ -105,6 +115,18 @@ class OpenblasConan(ConanFile):
             return comp_exe["fortran"]
         return None
 
+    @property
+    def _threading(self):
+        # TODO: remove use_thread option in few months
+        if self.options.use_thread != "deprecated":
+            return "pthreads" if self.options.use_thread else "serial"
+        return str(self.options.threading)
+
+    @property
+    def _use_llvm_openmp(self):
+        # apple-clang is the only supported compiler not shipping an OpenMP runtime
+        return self._threading == "openmp" and self.settings.compiler == "apple-clang"
+
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
@@ -113,6 +135,9 @@ class OpenblasConan(ConanFile):
         if self.options.shared:
             self.options.rm_safe("fPIC")
 
+        if self.options.use_thread != "deprecated":
+            self.output.warning("use_thread option is deprecated, use threading option instead")
+
         # When cross-compiling, OpenBLAS requires explicitly setting TARGET
         if cross_building(self, skip_x64_x86=True) and not self.options.target:
             # Try inferring the target from settings.arch
@@ -121,6 +146,15 @@ class OpenblasConan(ConanFile):
                 self.output.warning(f'Setting OpenBLAS TARGET={target} based on settings.arch. This may result in suboptimal performance. Set the "{self.name}/*:target=XXX" option to silence this warning.')
                 self.options.target = target
 
+    def requirements(self):
+        if self._use_llvm_openmp:
+            self.requires("llvm-openmp/[>=17.0.6 <21]")
+
+    def package_id(self):
+        if self.info.options.use_thread != "deprecated":
+            self.info.options.threading = "pthreads" if self.info.options.use_thread else "serial"
+        del self.info.options.use_thread
+
     def build_requirements(self):
         if Version(self.version) >= "0.3.29":
             self.tool_requires("cmake/[>=3.16 <4]")
@@ -132,6 +166,10 @@ class OpenblasConan(ConanFile):
             if self.settings.compiler not in ["gcc", "clang"]:
                 # ld: unknown option: --allow-multiple-definition on apple-clang
                 raise ConanInvalidConfiguration(f'"{self.name}/*:build_relapack=True" option is only supported for GCC and Clang')
+        for option in ["num_threads", "buffer_size"]:
+            value = self.options.get_safe(option)
+            if value and (not str(value).isdigit() or int(value) == 0):
+                raise ConanInvalidConfiguration(f'"{self.name}/*:{option}" option must be a positive integer, got "{value}"')
 
     def validate_build(self):
         # If we're cross-compiling, and the user didn't provide the target, and
@@ -162,8 +200,13 @@ class OpenblasConan(ConanFile):
         tc.variables["BUILD_RELAPACK"] = self.options.build_relapack
 
         tc.variables["DYNAMIC_ARCH"] = self.options.dynamic_arch
-        tc.variables["USE_THREAD"] = self.options.use_thread
+        tc.variables["USE_THREAD"] = self._threading != "serial"
+        tc.variables["USE_OPENMP"] = self._threading == "openmp"
         tc.variables["USE_LOCKING"] = self.options.use_locking
+        if self.options.num_threads:
+            tc.variables["NUM_THREADS"] = self.options.num_threads
+        if self.options.buffer_size:
+            tc.variables["BUFFERSIZE"] = self.options.buffer_size
 
         tc.variables["MSVC_STATIC_CRT"] = is_msvc_static_runtime(self)
 
@@ -179,6 +222,9 @@ class OpenblasConan(ConanFile):
             tc.cache_variables["CMAKE_POLICY_VERSION_MINIMUM"] = "3.5" # CMake 4 support
         tc.generate()
 
+        deps = CMakeDeps(self)
+        deps.generate()
+
     def build(self):
         cmake = CMake(self)
         cmake.configure()
@@ -203,22 +249,34 @@ class OpenblasConan(ConanFile):
         # CMake config file:
         # - OpenBLAS always has one and only one of these components: openmp, pthread or serial.
         # - Whatever if this component is requested or not, official CMake imported target is always OpenBLAS::OpenBLAS
-        # - TODO: add openmp component when implemented in this recipe
         self.cpp_info.set_property("cmake_file_name", "OpenBLAS")
         self.cpp_info.set_property("cmake_target_name", "OpenBLAS::OpenBLAS")
         self.cpp_info.set_property("pkg_config_name", "openblas")
         # 'pthread' causes issues without namespace
-        cmake_component_name = "pthread" if self.options.use_thread else "serial"  # TODO: how to model this in CMakeDeps?
+        cmake_component_name = {"pthreads": "pthread", "openmp": "openmp", "serial": "serial"}[self._threading]  # TODO: how to model this in CMakeDeps?
         self.cpp_info.components["openblas_component"].set_property("cmake_target_name", f"OpenBLAS::{cmake_component_name}")
         self.cpp_info.components["openblas_component"].set_property("pkg_config_name", "openblas")
         self.cpp_info.components["openblas_component"].includedirs.append(os.path.join("include", "openblas"))
         self.cpp_info.components["openblas_component"].libs = [self._lib_name]
         if self.settings.os in ["Linux", "FreeBSD"]:
             self.cpp_info.components["openblas_component"].system_libs.append("m")
-            if self.options.use_thread:
+            if self._threading != "serial":
                 self.cpp_info.components["openblas_component"].system_libs.append("pthread")
             if self.options.build_lapack and self._fortran_compiler:
                 self.cpp_info.components["openblas_component"].system_libs.append("gfortran")
+        if self._use_llvm_openmp:
+            self.cpp_info.components["openblas_component"].requires.append("llvm-openmp::llvm-openmp")
+        elif self._threading == "openmp" and not self.options.shared and not is_msvc(self):
+            # static libopenblas needs the OpenMP runtime of the compiler (libgomp for GCC)
+            self.cpp_info.components["openblas_component"].sharedlinkflags = ["-fopenmp"]
+            self.cpp_info.components["openblas_component"].exelinkflags = ["-fopenmp"]
+
+        # Build-time tuning of the thread pool, useful to consumers sizing their own parallelism
+        self.conf_info.define("user.openblas:threading", self._threading)
+        if self.options.num_threads:
+            self.conf_info.define("user.openblas:num_threads", int(self.options.num_threads))
+        if self.options.buffer_size:
+            self.conf_info.define("user.openblas:buffer_size", int(self.options.buffer_size))
 
         self.buildenv_info.define_path("OpenBLAS_HOME", self.package_folder)
         self.runenv_info.define_path("OpenBLAS_HOME", self.package_folder)
@@ -1,7 +1,7 @@
 from conan import ConanFile
 from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
-from conan.tools.build import check_min_cppstd, valid_min_cppstd
+from conan.tools.build import check_min_cppstd, cross_building, valid_min_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import apply_conandata_patches, collect_libs, copy, export_conandata_patches, get, rename, replace_in_file, rmdir, save
@@ -115,6 +115,7 @@ class OpenCVConan(ConanFile):
         "cuda_arch_bin": [None, "ANY"],
         "cpu_baseline": [None, "ANY"],
         "cpu_dispatch": [None, "ANY"],
+        "cpu_profile": [None, "x86-64-v2", "x86-64-v3", "x86-64-v4", "armv8.2-a+dotprod", "native"],
         "world": [True, False],
         "nonfree": [True, False],
         # dnn module options
@@ -174,6 +175,7 @@ class OpenCVConan(ConanFile):
         "cuda_arch_bin": None,
         "cpu_baseline": None,
         "cpu_dispatch": None,
+        "cpu_profile": None,
         "world": False,
         "nonfree": False,
         # dnn module options
@@ -264,6 +266,77 @@ class OpenCVConan(ConanFile):
     def _has_with_wayland_option(self):
         return self.settings.os in ["Linux", "FreeBSD"]
 
+    @property
+    def _cpu_known_optimizations(self):
+        # See CPU_ALL_OPTIMIZATIONS in cmake/OpenCVCompilerOptimizations.cmake
+        arch = str(self.settings.arch)
+        if arch in ["x86", "x86_64"]:
+            return [
+                "SSE", "SSE2", "SSE3", "SSSE3", "SSE4_1", "POPCNT", "SSE4_2", "FP16", "FMA3", "AVX", "AVX2",
+                "AVX_512F", "AVX512_COMMON", "AVX512_KNL", "AVX512_KNM", "AVX512_SKX", "AVX512_CNL",
+                "AVX512_CLX", "AVX512_ICL",
+            ]
+        if arch in ["armv8", "armv8.3", "arm64ec"]:
+            return ["NEON", "FP16", "NEON_DOTPROD", "NEON_FP16", "NEON_BF16"]
+        if arch.startswith("armv7"):
+            return ["VFPV3", "NEON", "FP16"]
+        if arch in ["ppc64le", "ppc64"]:
+            return ["VSX", "VSX3"]
+        if arch in ["mips", "mips64"]:
+            return ["MSA"]
+        if arch == "riscv64":
+            return ["RVV"]
+        if arch == "loongarch64":
+            return ["LSX", "LASX"]
+        return None
+
+    @property
+    def _cpu_profiles(self):
+        x86_64_v2 = ["SSE3", "SSSE3", "SSE4_1", "POPCNT", "SSE4_2"]
+        x86_64_v3 = x86_64_v2 + ["AVX", "FP16", "AVX2", "FMA3"]
+        x86_64_v4 = x86_64_v3 + ["AVX_512F", "AVX512_SKX"]
+        return {
+            "x86-64-v2": {
+                "archs": ["x86_64"],
+                "baseline": x86_64_v2,
+                "dispatch": ["AVX", "FP16", "AVX2", "AVX512_SKX"],
+            },
+            "x86-64-v3": {
+                "archs": ["x86_64"],
+                "baseline": x86_64_v3,
+                "dispatch": ["AVX512_SKX"],
+            },
+            "x86-64-v4": {
+                "archs": ["x86_64"],
+                "baseline": x86_64_v4,
+                "dispatch": [],
+            },
+            "armv8.2-a+dotprod": {
+                "archs": ["armv8", "armv8.3"],
+                "baseline": ["NEON", "FP16", "NEON_DOTPROD"],
+                "dispatch": ["NEON_FP16", "NEON_BF16"],
+            },
+            # DETECT lets OpenCV deduce the baseline from -march=native added in generate()
+            "native": {
+                "archs": None,
+                "baseline": ["DETECT"],
+                "dispatch": [],
+            },
+        }
+
+    @staticmethod
+    def _split_cpu_features(value):
+        return [token for token in re.split(r"[,;\s]+", str(value)) if token]
+
+    def _cpu_features(self, kind):
+        # explicit cpu_baseline/cpu_dispatch take precedence over the ones of cpu_profile
+        value = self.options.get_safe(f"cpu_{kind}")
+        if value or value == "":
+            return self._split_cpu_features(value)
+        if self.options.cpu_profile:
+            return self._cpu_profiles[str(self.options.cpu_profile)][kind]
+        return None
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -1159,6 +1232,33 @@ class OpenCVConan(ConanFile):
             raise ConanInvalidConfiguration(
                 "viz module can't be enabled yet. It requires VTK which is not available in conan-center."
             )
+        self._validate_cpu_optimizations()
+
+    def _validate_cpu_optimizations(self):
+        if self.options.cpu_profile:
+            profile = str(self.options.cpu_profile)
+            archs = self._cpu_profiles[profile]["archs"]
+            if archs and self.settings.arch not in archs:
+                raise ConanInvalidConfiguration(
+                    f"cpu_profile={profile} is not available for {self.settings.arch}"
+                )
+            if profile == "native":
+                if self._is_cl_like:
+                    raise ConanInvalidConfiguration("cpu_profile=native is not supported by MSVC or clang-cl")
+                if cross_building(self):
+                    raise ConanInvalidConfiguration("cpu_profile=native can't be used when cross-building")
+
+        known_optimizations = self._cpu_known_optimizations
+        if known_optimizations is None:
+            return
+        for kind, special_values in [("baseline", ["DETECT"]), ("dispatch", [])]:
+            features = self._cpu_features(kind) or []
+            unknown = [f for f in features if f not in known_optimizations + special_values]
+            if unknown:
+                raise ConanInvalidConfiguration(
+                    f"Unknown CPU optimizations in cpu_{kind} for {self.settings.arch}: {', '.join(unknown)}. "
+                    f"Possible values are: {', '.join(known_optimizations + special_values)}"
+                )
 
     def build_requirements(self):
         if self.options.get_safe("with_protobuf"):
@@ -1403,11 +1503,17 @@ class OpenCVConan(ConanFile):
         tc.variables["OPENCV_MODULES_PUBLIC"] = "opencv"
         tc.variables["OPENCV_ENABLE_NONFREE"] = self.options.nonfree
 
-        if self.options.cpu_baseline or self.options.cpu_baseline == "":
-            tc.variables["CPU_BASELINE"] = self.options.cpu_baseline
+        cpu_baseline = self._cpu_features("baseline")
+        if cpu_baseline is not None:
+            tc.variables["CPU_BASELINE"] = ";".join(cpu_baseline)
 
-        if self.options.cpu_dispatch or self.options.cpu_dispatch == "":
-            tc.variables["CPU_DISPATCH"] = self.options.cpu_dispatch
+        cpu_dispatch = self._cpu_features("dispatch")
+        if cpu_dispatch is not None:
+            tc.variables["CPU_DISPATCH"] = ";".join(cpu_dispatch)
+
+        if self.options.cpu_profile == "native":
+            tc.extra_cflags.append("-march=native")
+            tc.extra_cxxflags.append("-march=native")
 
         tc.variables["OPENCV_DNN_CUDA"] = self.options.get_safe("dnn_cuda", False)
 
@@ -1652,5 +1758,13 @@ class OpenCVConan(ConanFile):
         self.cpp_info.set_property("cmake_file_name", "OpenCV")
         self.cpp_info.set_property("cmake_build_modules", [self._module_vars_rel_path])
 
+        # Let consumers know which SIMD code paths are compiled in (unset means upstream defaults)
+        cpu_baseline = self._cpu_features("baseline")
+        if cpu_baseline is not None:
+            self.conf_info.define("user.opencv:cpu_baseline", cpu_baseline)
+        cpu_dispatch = self._cpu_features("dispatch")
+        if cpu_dispatch is not None:
+            self.conf_info.define("user.opencv:cpu_dispatch", cpu_dispatch)
+
         add_components(self._opencv_modules)
 
@@ -1,8 +1,8 @@
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import fix_apple_shared_install_name, is_apple_os, XCRun
 from conan.tools.build import build_jobs
-from conan.tools.files import chdir, copy, get, replace_in_file, rm, rmdir, save
+from conan.tools.files import chdir, copy, get, load, replace_in_file, rm, rmdir, save
 from conan.tools.gnu import AutotoolsToolchain
 from conan.tools.layout import basic_layout
 from conan.tools.microsoft import is_msvc, msvc_runtime_flag, unix_path
@@ -10,6 +10,7 @@ from conan.tools.scm import Version
 
 import fnmatch
 import os
+import re
 import textwrap
 
 required_conan_version = ">=1.57.0"
@@ -31,6 +32,7 @@ class OpenSSLConan(ConanFile):
         "386": [True, False],
         "capieng_dialog": [True, False],
         "enable_capieng": [True, False],
+        "enable_ktls": [True, False],
         "enable_trace": [True, False],
         "no_aria": [True, False],
         "no_apps": [True, False],
@@ -89,12 +91,20 @@ class OpenSSLConan(ConanFile):
         "no_zlib": [True, False],
         "openssldir": [None, "ANY"],
         "tls_security_level": [None, 0, 1, 2, 3, 4, 5],
+        "allocator": [None, "mimalloc", "jemalloc"],
+        "server_preset": [True, False],
     }
     default_options = {key: False for key in options.keys()}
     default_options["fPIC"] = True
     default_options["no_md2"] = True
     default_options["openssldir"] = None
     default_options["tls_security_level"] = None
+    default_options["allocator"] = None
+    options_description = {
+        "allocator": "Route OPENSSL_malloc() and friends to mimalloc or jemalloc through CRYPTO_set_mem_functions()",
+        "server_preset": "Configure flags for high-concurrency servers: no-autoload-config, no-module (static engines, "
+                         "no FIPS provider), no-legacy and enable-ec_nistp_64_gcc_128 when supported",
+    }
 
     @property
     def _is_clang_cl(self):
@@ -109,12 +119,31 @@ class OpenSSLConan(ConanFile):
     def _use_nmake(self):
         return self._is_clang_cl or is_msvc(self)
 
+    @property
+    def _server_preset_options(self):
+        # Avoid config file loading, dynamic provider/engine loading and legacy algorithms
+        # which all go through global locks during handshakes. FIPS provider is a module.
+        return ["no_autoload_config", "no_module", "no_legacy", "no_fips"]
+
+    def _is_enabled(self, option_name):
+        if self.options.server_preset and option_name in self._server_preset_options:
+            return True
+        return bool(self.options.get_safe(option_name, False))
+
+    @staticmethod
+    def _has_ec_nistp_64_gcc_128(settings):
+        is_clang_cl = settings.os == "Windows" and settings.compiler == "clang" and settings.compiler.get_safe("runtime")
+        return settings.arch in ["x86_64", "armv8", "armv8.3", "ppc64le", "s390x", "riscv64"] and \
+               settings.compiler in ["gcc", "clang", "apple-clang"] and not is_clang_cl
+
     def config_options(self):
         if self.settings.os != "Windows":
             self.options.rm_safe("capieng_dialog")
             self.options.rm_safe("enable_capieng")
         else:
             self.options.rm_safe("fPIC")
+        if self.settings.os != "Linux":
+            self.options.rm_safe("enable_ktls")
 
     def configure(self):
         if self.options.shared:
@@ -128,10 +157,37 @@ class OpenSSLConan(ConanFile):
     def requirements(self):
         if not self.options.no_zlib:
             self.requires("zlib/[>=1.2.11 <2]")
+        if self.options.allocator == "mimalloc":
+            self.requires("mimalloc/[>=2.1.7 <3]")
+        elif self.options.allocator == "jemalloc":
+            self.requires("jemalloc/[>=5.2.1 <6]")
+        if self.options.get_safe("enable_ktls"):
+            # Configure silently disables kTLS if <linux/tls.h> is missing or too old in the sysroot
+            self.requires("linux-headers-generic/6.5.9")
 
     def validate(self):
         if self.settings.os == "iOS" and self.options.shared:
             raise ConanInvalidConfiguration("OpenSSL 3 does not support building shared libraries for iOS")
+        if self.options.get_safe("enable_ktls") and self.options.no_sock:
+            raise ConanInvalidConfiguration(f"{self.ref}:enable_ktls=True requires sockets, it is not compatible with no_sock=True")
+        if self.options.allocator:
+            if self._use_nmake:
+                raise ConanInvalidConfiguration(f"{self.ref}:allocator={self.options.allocator} is not supported with MSVC or clang-cl")
+            if self.options.allocator == "mimalloc":
+                mimalloc_options = self.dependencies["mimalloc"].options
+                if mimalloc_options.get_safe("inject") or mimalloc_options.get_safe("single_object"):
+                    raise ConanInvalidConfiguration(
+                        f"{self.ref}:allocator=mimalloc requires a mimalloc library, set mimalloc/*:inject=False and mimalloc/*:single_object=False"
+                    )
+
+    def package_id(self):
+        # server_preset only adds enable-ec_nistp_64_gcc_128 on top of the individual no_* options,
+        # so the same set of explicit booleans must give the same package id
+        if self.info.options.server_preset:
+            for option_name in self._server_preset_options:
+                setattr(self.info.options, option_name, True)
+        if not self._has_ec_nistp_64_gcc_128(self.info.settings):
+            self.info.options.rm_safe("server_preset")
 
     def build_requirements(self):
         if self.settings_build.os == "Windows":
@@ -366,7 +422,7 @@ class OpenSSLConan(ConanFile):
         else:
             args.append("-fPIC" if self.options.get_safe("fPIC", True) else "no-pic")
 
-        args.append("no-fips" if self.options.get_safe("no_fips", True) else "enable-fips")
+        args.append("no-fips" if self._is_enabled("no_fips") else "enable-fips")
         args.append("no-md2" if self.options.get_safe("no_md2", True) else "enable-md2")
         if str(self.options.tls_security_level) != "None":
             args.append(f"-DOPENSSL_TLS_SECURITY_LEVEL={self.options.tls_security_level}")
@@ -374,6 +430,17 @@ class OpenSSLConan(ConanFile):
         if self.options.get_safe("enable_trace"):
             args.append("enable-trace")
 
+        if self.options.server_preset and self._has_ec_nistp_64_gcc_128(self.settings):
+            args.append("enable-ec_nistp_64_gcc_128")
+
+        if self.options.allocator:
+            # Used by the functions added to crypto/mem.c in _patch_allocator()
+            args.extend(f"-DCONAN_ALLOCATOR_{name.upper()}={function}"
+                        for name, function in zip(("malloc", "realloc", "free"), self._allocator_functions))
+            allocator_cpp_info = self.dependencies[str(self.options.allocator)].cpp_info.aggregated_components()
+            args.extend(f'-L"{self._adjust_path(libdir)}"' for libdir in allocator_cpp_info.libdirs)
+            args.extend(f"-l{lib}" for lib in allocator_cpp_info.libs + allocator_cpp_info.system_libs)
+
         if self.settings.os == "Neutrino":
             args.append("no-asm -lsocket -latomic")
 
@@ -406,7 +473,7 @@ class OpenSSLConan(ConanFile):
             ])
 
         for option_name in self.default_options.keys():
-            if self.options.get_safe(option_name, False) and option_name not in ("shared", "fPIC", "openssldir", "tls_security_level", "capieng_dialog", "enable_capieng", "zlib", "no_fips", "no_md2"):
+            if self._is_enabled(option_name) and option_name not in ("shared", "fPIC", "openssldir", "tls_security_level", "capieng_dialog", "enable_capieng", "zlib", "no_fips", "no_md2", "allocator", "server_preset"):
                 self.output.info(f"Activated option: {option_name}")
                 args.append(option_name.replace("_", "-"))
         return args
@@ -420,6 +487,11 @@ class OpenSSLConan(ConanFile):
             env.define_path("CROSS_SDK", os.path.basename(xcrun.sdk_path))
             env.define_path("CROSS_TOP", os.path.dirname(os.path.dirname(xcrun.sdk_path)))
 
+        if self.options.get_safe("enable_ktls"):
+            # Also visible to the `$CC -E` probe of <linux/tls.h> in Configure, which ignores CFLAGS
+            linux_headers_includedir = self.dependencies["linux-headers-generic"].cpp_info.includedirs[0]
+            env.prepend_path("C_INCLUDE_PATH", linux_headers_includedir)
+
         if is_apple_os(self) and self.options.shared:
             # Inject -headerpad_max_install_names for shared library, otherwise fix_apple_shared_install_name() may fail.
             # See https://github.com/conan-io/conan-center-index/issues/27424
@@ -489,6 +561,13 @@ class OpenSSLConan(ConanFile):
 
         save(self, os.path.join(self.source_folder, "Configurations", "20-conan.conf"), config)
 
+    @property
+    def _allocator_functions(self):
+        if self.options.allocator == "mimalloc":
+            return "mi_malloc", "mi_realloc", "mi_free"
+        prefix = self.dependencies["jemalloc"].options.prefix
+        return f"{prefix}malloc", f"{prefix}realloc", f"{prefix}free"
+
     def _run_make(self, targets=None, parallel=True, install=False):
         command = [self._make_program]
         if install:
@@ -513,6 +592,10 @@ class OpenSSLConan(ConanFile):
                 self._replace_runtime_in_file(os.path.join("Configurations", "10-main.conf"))
 
             self.run(f"{self._perl} ./Configure {args}", env="conanbuild")
+            if self.options.get_safe("enable_ktls"):
+                configuration_h = load(self, os.path.join("include", "openssl", "configuration.h"))
+                if "OPENSSL_NO_KTLS" in configuration_h:
+                    raise ConanException("kTLS has been disabled by OpenSSL Configure, kernel headers are too old")
             if self._use_nmake:
                 # When `--prefix=/`, the scripts derive `\` without escaping, which
                 # causes issues on Windows
@@ -531,7 +614,56 @@ class OpenSSLConan(ConanFile):
         with chdir(self, self.source_folder):
             self._run_make(targets=["install_sw"], parallel=False, install=True)
 
+    def _patch_allocator(self):
+        # The default implementations of OPENSSL_malloc() and friends are the initial values of
+        # malloc_impl, realloc_impl and free_impl in crypto/mem.c. Pointing them to the allocator
+        # there, instead of calling CRYPTO_set_mem_functions() from another object, makes sure
+        # the code is linked from the static library as well.
+        mem_c = os.path.join(self.source_folder, "crypto", "mem.c")
+        content = load(self, mem_c)
+        if "conan_allocator_malloc" in content:
+            return
+        shim = textwrap.dedent("""\
+            void *CONAN_ALLOCATOR_MALLOC(size_t size);
+            void *CONAN_ALLOCATOR_REALLOC(void *ptr, size_t size);
+            void CONAN_ALLOCATOR_FREE(void *ptr);
+
+            static void *conan_allocator_malloc(size_t num, const char *file, int line)
+            {
+                (void)file;
+                (void)line;
+                return num == 0 ? NULL : CONAN_ALLOCATOR_MALLOC(num);
+            }
+
+            static void *conan_allocator_realloc(void *addr, size_t num, const char *file, int line)
+            {
+                (void)file;
+                (void)line;
+                return CONAN_ALLOCATOR_REALLOC(addr, num);
+            }
+
+            static void conan_allocator_free(void *addr, const char *file, int line)
+            {
+                (void)file;
+                (void)line;
+                CONAN_ALLOCATOR_FREE(addr);
+            }
+
+        """)
+        for index, name in enumerate(("malloc", "realloc", "free")):
+            pattern = rf"(static[^;]*\b{name}_impl\b[^;]*=\s*)CRYPTO_{name}\s*;"
+            match = re.search(pattern, content)
+            if not match:
+                raise ConanException(f"{self.ref}:allocator could not find the initial value of {name}_impl in {mem_c}")
+            replacement = f"{match.group(1)}conan_allocator_{name};"
+            if index == 0:
+                replacement = shim + replacement
+            content = content[:match.start()] + replacement + content[match.end():]
+        save(self, mem_c, content)
+
     def build(self):
+        if self.options.allocator:
+            self._patch_allocator()
         self._make()
         configdata_pm = self._adjust_path(os.path.join(self.source_folder, "configdata.pm"))
         self.run(f"{self._perl} {configdata_pm} --dump")
@@ -565,7 +697,7 @@ class OpenSSLConan(ConanFile):
                 if file.endswith(".a"):
                     os.unlink(os.path.join(libdir, file))
 
-        if not self.options.no_fips:
+        if not self._is_enabled("no_fips"):
             provdir = os.path.join(self.source_folder, "providers")
             modules_dir = os.path.join(self.package_folder, "lib", "ossl-modules")
             if self.settings.os == "Macos":
@@ -653,6 +785,8 @@ class OpenSSLConan(ConanFile):
 
         if not self.options.no_zlib:
             self.cpp_info.components["crypto"].requires.append("zlib::zlib")
+        if self.options.allocator:
+            self.cpp_info.components["crypto"].requires.append(f"{self.options.allocator}::{self.options.allocator}")
 
         if self.settings.os == "Windows":
             self.cpp_info.components["crypto"].system_libs.extend(["crypt32", "ws2_32", "advapi32", "user32", "bcrypt"])
@@ -675,3 +809,6 @@ class OpenSSLConan(ConanFile):
 
         openssl_modules_dir = os.path.join(self.package_folder, "lib", "ossl-modules")
         self.runenv_info.define_path("OPENSSL_MODULES", openssl_modules_dir)
+
+        # Allow consumers to enable SSL_sendfile() code paths. OPENSSL_NO_KTLS is defined otherwise.
+        self.conf_info.define("user.openssl:ktls", bool(self.options.get_safe("enable_ktls", False)))
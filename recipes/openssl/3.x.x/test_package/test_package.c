@@ -12,6 +12,19 @@ int main()
 	
 	digest();
 
+#if defined(OPENSSL_WITH_ALLOCATOR)
+	{
+		CRYPTO_malloc_fn malloc_fn;
+		CRYPTO_realloc_fn realloc_fn;
+		CRYPTO_free_fn free_fn;
+		CRYPTO_get_mem_functions(&malloc_fn, &realloc_fn, &free_fn);
+		if (malloc_fn == CRYPTO_malloc || realloc_fn == CRYPTO_realloc || free_fn == CRYPTO_free) {
+			printf("OpenSSL does not use the allocator of the allocator option\n");
+			return 1;
+		}
+	}
+#endif
+
 #if defined(TEST_OPENSSL_LEGACY)
 	legacy_result = digest_legacy();
 	if (legacy_result != 0) {
@@ -29,6 +29,7 @@ class ProtobufConan(ConanFile):
         "lite": [True, False],
         "upb": [True, False],
         "debug_suffix": [True, False],
+        "optimize_for": [None, "code_size", "lite"],
     }
     default_options = {
         "shared": False,
@@ -38,6 +39,12 @@ class ProtobufConan(ConanFile):
         "lite": False,
         "upb": False,
         "debug_suffix": True,
+        "optimize_for": None,
+    }
+    options_description = {
+        "optimize_for": "optimize_for mode of the C++ code generated by the packaged protoc for .proto files "
+                        "that do not declare it (upstream uses speed). The option of the .proto files and "
+                        "explicit --cpp_opt parameters still take precedence",
     }
 
     short_paths = True
@@ -55,6 +62,15 @@ class ProtobufConan(ConanFile):
         current_ver = Version(self.version)
         return Version(f"{current_ver.minor}.{current_ver.patch}")
 
+    @property
+    def _optimize_for_generator(self):
+        # C++ generator source whose Options carry EnforceOptimizeMode, None if this release has none
+        if self._protobuf_release >= "22.0":
+            return os.path.join("src", "google", "protobuf", "compiler", "cpp", "generator.cc")
+        if self._protobuf_release >= "20.0":
+            return os.path.join("src", "google", "protobuf", "compiler", "cpp", "cpp_generator.cc")
+        return None
+
     def export_sources(self):
         export_conandata_patches(self)
         copy(self, "protobuf-conan-protoc-target.cmake", self.recipe_folder, os.path.join(self.export_sources_folder, "src"))
@@ -118,6 +134,11 @@ class ProtobufConan(ConanFile):
 
         check_min_vs(self, "190")
 
+        if self.settings.os == "tvOS" and self.options.optimize_for:
+            raise ConanInvalidConfiguration(f"{self.ref} optimize_for requires protoc, which is not built on tvOS")
+        if self.options.optimize_for and not self._optimize_for_generator:
+            raise ConanInvalidConfiguration(f"{self.ref} optimize_for is not supported by this version of protoc")
+
         if self.settings.compiler == "clang":
             if Version(self.settings.compiler.version) < "4":
                 raise ConanInvalidConfiguration(f"{self.ref} doesn't support clang < 4")
@@ -206,6 +227,21 @@ class ProtobufConan(ConanFile):
             "endif()",
         )
 
+        if self.options.optimize_for:
+            # Only used as a fallback, the --cpp_opt parameters are parsed afterwards
+            cpp_generator = os.path.join(self.source_folder, self._optimize_for_generator)
+            enforce_mode = {
+                "code_size": "kCodeSize",
+                "lite": "kLiteRuntime",
+            }[str(self.options.optimize_for)]
+            replace_in_file(self, cpp_generator,
+                "  Options file_options;\n",
+                "  Options file_options;\n"
+                "  if (!file->options().has_optimize_for()) {\n"
+                f"    file_options.enforce_mode = EnforceOptimizeMode::{enforce_mode};\n"
+                "  }\n",
+            )
+
     def build(self):
         self._patch_sources()
         cmake = CMake(self)
@@ -246,6 +282,9 @@ class ProtobufConan(ConanFile):
         ]
         self.cpp_info.set_property("cmake_build_modules", build_modules)
 
+        if self.options.optimize_for:
+            self.conf_info.define("user.protobuf:optimize_for", str(self.options.optimize_for))
+
         lib_prefix = "lib" if (is_msvc(self) or self._is_clang_cl) else ""
         lib_suffix = "d" if self.settings.build_type == "Debug" and self.options.debug_suffix else ""
 
@@ -0,0 +1,114 @@
+// Measures the parsing throughput of JSON files with the On-Demand and DOM
+// front-ends, fully traversing every document.
+//
+// Usage: simdjson-bench [-n iterations] file.json...
+
+#include <simdjson.h>
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <functional>
+#include <string>
+#include <vector>
+
+using namespace simdjson;
+
+namespace {
+
+size_t traverse(ondemand::value element) {
+    size_t count = 1;
+    switch (element.type()) {
+        case ondemand::json_type::array:
+            for (auto child : element.get_array()) {
+                count += traverse(child.value());
+            }
+            break;
+        case ondemand::json_type::object:
+            for (auto field : element.get_object()) {
+                count += traverse(field.value());
+            }
+            break;
+        case ondemand::json_type::number:
+            (void)element.get_double();
+            break;
+        case ondemand::json_type::string:
+            (void)element.get_string();
+            break;
+        default:
+            break;
+    }
+    return count;
+}
+
+size_t traverse(dom::element element) {
+    size_t count = 1;
+    if (element.is_array()) {
+        for (dom::element child : dom::array(element)) {
+            count += traverse(child);
+        }
+    } else if (element.is_object()) {
+        for (dom::key_value_pair field : dom::object(element)) {
+            count += traverse(field.value);
+        }
+    }
+    return count;
+}
+
+void run(const char* name, const padded_string& json, int iterations, const std::function<size_t()>& parse) {
+    size_t values = parse();  // warm-up, also sizes the parser buffers
+    const auto start = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; ++i) {
+        values = parse();
+    }
+    const std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+    const double bytes = static_cast<double>(json.size()) * iterations;
+    std::printf("  %-9s %8.3f GB/s  %10.0f documents/s  (%zu values)\n",
+                name, bytes / elapsed.count() / 1e9, iterations / elapsed.count(), values);
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    int iterations = 100;
+    std::vector<const char*> files;
+    for (int i = 1; i < argc; ++i) {
+        if (std::strcmp(argv[i], "-n") == 0 && i + 1 < argc) {
+            iterations = std::atoi(argv[++i]);
+        } else {
+            files.push_back(argv[i]);
+        }
+    }
+    if (files.empty() || iterations < 1) {
+        std::fprintf(stderr, "Usage: %s [-n iterations] file.json...\n", argv[0]);
+        return 1;
+    }
+
+    std::printf("simdjson %s, implementation %s\n", SIMDJSON_VERSION, get_active_implementation()->name().c_str());
+    for (const char* file : files) {
+        padded_string json;
+        auto error = padded_string::load(file).get(json);
+        if (error) {
+            std::fprintf(stderr, "Could not load %s: %s\n", file, error_message(error));
+            return 1;
+        }
+        std::printf("%s (%zu bytes)\n", file, json.size());
+
+        try {
+            ondemand::parser ondemand_parser;
+            run("ondemand", json, iterations, [&]() {
+                ondemand::document doc = ondemand_parser.iterate(json);
+                return traverse(doc.get_value());
+            });
+            dom::parser dom_parser;
+            run("dom", json, iterations, [&]() {
+                return traverse(dom_parser.parse(json));
+            });
+        } catch (const simdjson_error& e) {
+            std::fprintf(stderr, "Could not parse %s: %s\n", file, e.what());
+            return 1;
+        }
+    }
+    return 0;
+}
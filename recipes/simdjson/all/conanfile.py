@@ -1,7 +1,8 @@
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.build import check_min_cppstd
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
-from conan.tools.files import copy, get, rmdir
+from conan.tools.files import copy, get, rmdir, save
 from conan.tools.microsoft import is_msvc
 import os
 
@@ -22,15 +23,49 @@ class SimdjsonConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "threads": [True, False],
+        "implementations": [None, "ANY"],
+        "with_benchmarks": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "threads": True,
+        "implementations": None,
+        "with_benchmarks": False,
+    }
+    options_description = {
+        "implementations": "Comma-separated list of the kernels to compile (haswell, icelake, westmere, arm64, fallback, ...), "
+                           "all the others are excluded. By default, every kernel the target can run is compiled and "
+                           "selected at runtime",
+        "with_benchmarks": "Build and package simdjson-bench, which reports the On-Demand and DOM parsing throughput of JSON files",
     }
 
     implements = ["auto_shared_fpic"]
 
+    @property
+    def _all_implementations(self):
+        # SIMDJSON_ALL_IMPLEMENTATIONS in cmake/implementation-flags.cmake, by architecture
+        return {
+            "x86_64": ["icelake", "haswell", "westmere"],
+            "armv8": ["arm64"],
+            "armv8.3": ["arm64"],
+            "ppc64le": ["ppc64"],
+            "loongarch64": ["lasx", "lsx"],
+        }.get(str(self.settings.arch), []) + ["fallback"]
+
+    @property
+    def _implementations(self):
+        if not self.options.implementations:
+            return None
+        return [impl.strip() for impl in str(self.options.implementations).split(",") if impl.strip()]
+
+    @property
+    def _excluded_implementations(self):
+        return [impl for impl in self._all_implementations if impl not in self._implementations]
+
+    def export_sources(self):
+        copy(self, "*", os.path.join(self.recipe_folder, "benchmark"), os.path.join(self.export_sources_folder, "src", "conan_benchmark"))
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
@@ -40,6 +75,14 @@ class SimdjsonConan(ConanFile):
     def validate(self):
         # https://github.com/simdjson/simdjson/blob/0c0ce1bd48baa0677dc7c0945ea7cd1e8b52b297/CMakeLists.txt#L103
         check_min_cppstd(self, 11)
+        if self.options.implementations:
+            implementations = self._implementations
+            unknown = [impl for impl in implementations if impl not in self._all_implementations]
+            if not implementations or unknown:
+                raise ConanInvalidConfiguration(
+                    f"implementations='{self.options.implementations}' is invalid for {self.settings.arch}, "
+                    f"possible values: {', '.join(self._all_implementations)}"
+                )
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -52,9 +95,17 @@ class SimdjsonConan(ConanFile):
         cppstd = str(self.settings.compiler.cppstd).replace("gnu", "")
         tc.cache_variables["SIMDJSON_CXX_STANDARD"] = cppstd
 
+        if self.options.implementations:
+            tc.cache_variables["SIMDJSON_IMPLEMENTATION"] = ";".join(self._implementations)
+            tc.cache_variables["SIMDJSON_EXCLUDE_IMPLEMENTATION"] = ";".join(self._excluded_implementations)
+
         tc.generate()
 
     def build(self):
+        if self.options.with_benchmarks:
+            benchmark_folder = os.path.join(self.source_folder, "conan_benchmark").replace("\\", "/")
+            save(self, os.path.join(self.source_folder, "CMakeLists.txt"),
+                 f'\nadd_subdirectory("{benchmark_folder}" conan_benchmark)\n', append=True)
         cmake = CMake(self)
         cmake.configure()
         cmake.build()
@@ -78,6 +129,10 @@ class SimdjsonConan(ConanFile):
             self.cpp_info.defines = ["SIMDJSON_THREADS_ENABLED=1"]
             if self.settings.os in ["Linux", "FreeBSD"]:
                 self.cpp_info.system_libs.append("pthread")
+        if self.options.implementations:
+            # Public compile definitions of the simdjson target, the kernels are selected in the headers too
+            self.cpp_info.defines.extend(f"SIMDJSON_IMPLEMENTATION_{impl.upper()}=1" for impl in self._implementations)
+            self.cpp_info.defines.extend(f"SIMDJSON_IMPLEMENTATION_{impl.upper()}=0" for impl in self._excluded_implementations)
         if self.options.shared:
             self.cpp_info.defines.append("SIMDJSON_USING_LIBRARY=1")
             if is_msvc(self):
@@ -48,6 +48,14 @@ class Sqlite3Conan(ConanFile):
         "build_executable": [True, False],
         "enable_default_vfs": [True, False],
         "enable_dbpage_vtab": [True, False],
+        "default_mmap_size": [None, "ANY"],
+        "max_mmap_size": [None, "ANY"],
+        "default_page_size": [None, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536],
+        "default_cache_size": [None, "ANY"],
+        "default_wal_synchronous": [None, "off", "normal", "full", "extra"],
+        "default_memstatus": [True, False],
+        "like_doesnt_match_blobs": [True, False],
+        "max_worker_threads": [None, "ANY"],
     }
     default_options = {
         "shared": False,
@@ -80,6 +88,14 @@ class Sqlite3Conan(ConanFile):
         "build_executable": True,
         "enable_default_vfs": True,
         "enable_dbpage_vtab": False,
+        "default_mmap_size": None,        # Uses default value from source
+        "max_mmap_size": None,            # Uses default value from source
+        "default_page_size": None,        # Uses default value from source
+        "default_cache_size": None,       # Uses default value from source
+        "default_wal_synchronous": None,  # Same as synchronous
+        "default_memstatus": True,
+        "like_doesnt_match_blobs": False,
+        "max_worker_threads": None,       # Uses default value from source
     }
 
     exports_sources = "CMakeLists.txt"
@@ -108,6 +124,14 @@ class Sqlite3Conan(ConanFile):
                 raise ConanInvalidConfiguration("build_executable=True cannot be combined with enable_default_vfs=False")
             if self.options.omit_load_extension:
                 raise ConanInvalidConfiguration("build_executable=True requires omit_load_extension=True")
+        for option in ["default_mmap_size", "max_mmap_size", "default_cache_size", "max_worker_threads"]:
+            value = self.options.get_safe(option)
+            if value is not None and value.value is not None and not str(value).lstrip("-").isdigit():
+                raise ConanInvalidConfiguration(f"{option} must be an integer, got '{value}'")
+        # "0" is a valid value but a falsy option, compare against None instead
+        if self.options.default_mmap_size.value is not None and self.options.max_mmap_size.value is not None and \
+                int(str(self.options.default_mmap_size)) > int(str(self.options.max_mmap_size)):
+            raise ConanInvalidConfiguration("default_mmap_size can't be greater than max_mmap_size")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -153,6 +177,20 @@ class Sqlite3Conan(ConanFile):
             tc.variables["MAX_BLOB_SIZE"] = self.options.max_blob_size
         tc.variables["DISABLE_DEFAULT_VFS"] = not self.options.enable_default_vfs
         tc.variables["ENABLE_DBPAGE_VTAB"] = self.options.enable_dbpage_vtab
+        if self.options.default_mmap_size.value is not None:
+            tc.variables["DEFAULT_MMAP_SIZE"] = self.options.default_mmap_size
+        if self.options.max_mmap_size.value is not None:
+            tc.variables["MAX_MMAP_SIZE"] = self.options.max_mmap_size
+        if self.options.default_page_size.value is not None:
+            tc.variables["DEFAULT_PAGE_SIZE"] = self.options.default_page_size
+        if self.options.default_cache_size.value is not None:
+            tc.variables["DEFAULT_CACHE_SIZE"] = self.options.default_cache_size
+        if self.options.default_wal_synchronous.value is not None:
+            tc.variables["DEFAULT_WAL_SYNCHRONOUS"] = ["off", "normal", "full", "extra"].index(str(self.options.default_wal_synchronous))
+        tc.variables["DEFAULT_MEMSTATUS"] = self.options.default_memstatus
+        tc.variables["LIKE_DOESNT_MATCH_BLOBS"] = self.options.like_doesnt_match_blobs
+        if self.options.max_worker_threads.value is not None:
+            tc.variables["MAX_WORKER_THREADS"] = self.options.max_worker_threads
         tc.generate()
 
     def build(self):
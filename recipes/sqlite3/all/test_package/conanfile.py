@@ -23,4 +23,22 @@ class TestPackageConan(ConanFile):
     def test(self):
         if can_run(self):
             bin_path = os.path.join(self.cpp.build.bindirs[0], "test_package")
-            self.run(bin_path, env="conanrun")
+            self.run(" ".join([bin_path] + self._expected_compile_options), env="conanrun")
+
+    @property
+    def _expected_compile_options(self):
+        # Values such as 0 or off must reach the build as well
+        sqlite3_options = self.dependencies[self.tested_reference_str].options
+        compile_options = []
+        for option, define in [("default_mmap_size", "DEFAULT_MMAP_SIZE"),
+                               ("max_mmap_size", "MAX_MMAP_SIZE"),
+                               ("default_cache_size", "DEFAULT_CACHE_SIZE"),
+                               ("max_worker_threads", "MAX_WORKER_THREADS")]:
+            value = sqlite3_options.get_safe(option)
+            if value is not None and value.value is not None:
+                compile_options.append(f"{define}={value}")
+        wal_synchronous = sqlite3_options.get_safe("default_wal_synchronous")
+        if wal_synchronous is not None and wal_synchronous.value is not None:
+            level = ["off", "normal", "full", "extra"].index(str(wal_synchronous))
+            compile_options.append(f"DEFAULT_WAL_SYNCHRONOUS={level}")
+        return compile_options
@@ -1,7 +1,18 @@
 #include <stdio.h>
 #include <sqlite3.h>
 
-int main() {
+int main(int argc, char **argv) {
+    int i;
+    int ret = 0;
+
     printf("SQLite Version: %s\n", sqlite3_libversion());
-    return 0;
+
+    /* Compile options expected from the package options, e.g. MAX_MMAP_SIZE=0 */
+    for (i = 1; i < argc; ++i) {
+        if (!sqlite3_compileoption_used(argv[i])) {
+            fprintf(stderr, "SQLite was not compiled with %s\n", argv[i]);
+            ret = 1;
+        }
+    }
+    return ret;
 }
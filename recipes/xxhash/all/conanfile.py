@@ -1,5 +1,6 @@
 from conan import ConanFile
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
+from conan.tools.layout import basic_layout
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rmdir
 from conan.tools.scm import Version
 import os
@@ -20,11 +21,20 @@ class XxHashConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "utility": [True, False],
+        "dispatch": [True, False],
+        "header_only": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "utility": True,
+        "dispatch": False,
+        "header_only": False,
+    }
+    options_description = {
+        "dispatch": "Build xxh_x86dispatch.c, so that XXH3 selects its SSE2, AVX2 or AVX512 kernel at runtime. "
+                    "Consumers get the dispatched functions by including xxh_x86dispatch.h",
+        "header_only": "Package the headers only and define XXH_INLINE_ALL for consumers",
     }
 
     def export_sources(self):
@@ -33,23 +43,43 @@ class XxHashConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if Version(self.version) < "0.8.2" or self.settings.arch not in ["x86", "x86_64"]:
+            # The DISPATCH CMake option is available since 0.8.2
+            del self.options.dispatch
 
     def configure(self):
-        if self.options.shared:
+        if self.options.header_only:
+            self.options.rm_safe("fPIC")
+            self.options.rm_safe("shared")
+            self.options.rm_safe("utility")
+            self.options.rm_safe("dispatch")
+            self.package_type = "header-library"
+        elif self.options.shared:
             self.options.rm_safe("fPIC")
         self.settings.rm_safe("compiler.cppstd")
         self.settings.rm_safe("compiler.libcxx")
 
     def layout(self):
-        cmake_layout(self, src_folder="src")
+        if self.options.header_only:
+            basic_layout(self, src_folder="src")
+        else:
+            cmake_layout(self, src_folder="src")
+
+    def package_id(self):
+        if self.info.options.header_only:
+            self.info.clear()
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
     def generate(self):
+        if self.options.header_only:
+            return
         tc = CMakeToolchain(self)
         tc.variables["XXHASH_BUNDLED_MODE"] = False
         tc.variables["XXHASH_BUILD_XXHSUM"] = self.options.utility
+        if self.options.get_safe("dispatch"):
+            tc.variables["DISPATCH"] = True
         # Fix CMake configuration if target is iOS/tvOS/watchOS
         tc.cache_variables["CMAKE_MACOSX_BUNDLE"] = False
         # Generate a relocatable shared lib on Macos
@@ -60,12 +90,21 @@ class XxHashConan(ConanFile):
 
     def build(self):
         apply_conandata_patches(self)
+        if self.options.header_only:
+            return
         cmake = CMake(self)
         cmake.configure(build_script_folder=os.path.join(self.source_folder, "cmake_unofficial"))
         cmake.build()
 
     def package(self):
         copy(self, "LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        if self.options.header_only:
+            # With XXH_INLINE_ALL, xxhash.h provides the whole implementation as static inline functions
+            for header in ["xxhash.h", "xxh3.h"]:
+                copy(self, header, src=self.source_folder, dst=os.path.join(self.package_folder, "include"))
+            return
+        if self.options.get_safe("dispatch"):
+            copy(self, "xxh_x86dispatch.h", src=self.source_folder, dst=os.path.join(self.package_folder, "include"))
         cmake = CMake(self)
         cmake.install()
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
@@ -77,5 +116,10 @@ class XxHashConan(ConanFile):
         self.cpp_info.set_property("cmake_target_name", "xxHash::xxhash")
         self.cpp_info.set_property("pkg_config_name", "libxxhash")
         # TODO: back to global scope in conan v2 once cmake_find_package_* generators removed
-        self.cpp_info.components["libxxhash"].libs = ["xxhash"]
         self.cpp_info.components["libxxhash"].set_property("cmake_target_name", "xxHash::xxhash")
+        if self.options.header_only:
+            self.cpp_info.components["libxxhash"].defines.append("XXH_INLINE_ALL")
+            self.cpp_info.components["libxxhash"].libdirs = []
+            self.cpp_info.components["libxxhash"].bindirs = []
+        else:
+            self.cpp_info.components["libxxhash"].libs = ["xxhash"]
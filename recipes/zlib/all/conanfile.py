@@ -21,10 +21,12 @@ class ZlibConan(ConanFile):
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
+        "with_runtime_cpu_detection": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
+        "with_runtime_cpu_detection": False,
     }
 
     def export_sources(self):
@@ -33,6 +35,9 @@ class ZlibConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        # SIMD crc32 (PCLMUL / ARMv8 CRC), adler32 (SSSE3 / NEON) and match comparison (SSE2 / AVX2)
+        if str(self.settings.arch) not in ["x86", "x86_64", "armv8"]:
+            del self.options.with_runtime_cpu_detection
 
     def configure(self):
         if self.options.shared:
@@ -57,6 +62,7 @@ class ZlibConan(ConanFile):
         tc.variables["INSTALL_LIB_DIR"] = "lib"
         tc.variables["INSTALL_INC_DIR"] = "include"
         tc.variables["ZLIB_BUILD_EXAMPLES"] = False
+        tc.cache_variables["ZLIB_RUNTIME_CPU_DETECTION"] = self.options.get_safe("with_runtime_cpu_detection", False)
         tc.generate()
 
     def _patch_sources(self):
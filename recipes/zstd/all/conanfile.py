@@ -1,6 +1,8 @@
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 from conan.tools.files import apply_conandata_patches, collect_libs, copy, export_conandata_patches, get, replace_in_file, rmdir, rm
+from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 import glob
 import os
@@ -22,12 +24,20 @@ class ZstdConan(ConanFile):
         "fPIC": [True, False],
         "threading": [True, False],
         "build_programs": [True, False],
+        # Oldest legacy format (v0.N) the decoder still accepts, 0 disables legacy support,
+        # None keeps the upstream default of each version
+        "legacy_support": [None, 0, 1, 2, 3, 4, 5, 6, 7],
+        "build_compression": [True, False],
+        "with_asm": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "threading": True,
         "build_programs": True,
+        "legacy_support": None,
+        "build_compression": True,
+        "with_asm": True,
     }
 
     def export_sources(self):
@@ -36,6 +46,12 @@ class ZstdConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if Version(self.version) < "1.5.6":
+            # ZSTD_BUILD_COMPRESSION and friends appeared in 1.5.6
+            del self.options.build_compression
+        if Version(self.version) < "1.5.2" or self.settings.arch != "x86_64" or is_msvc(self):
+            # The assembly Huffman decoder only exists for x86_64 with GNU-like compilers
+            del self.options.with_asm
 
     def configure(self):
         if self.options.shared:
@@ -43,6 +59,10 @@ class ZstdConan(ConanFile):
         self.settings.rm_safe("compiler.cppstd")
         self.settings.rm_safe("compiler.libcxx")
 
+    def validate(self):
+        if not self.options.get_safe("build_compression", True) and self.options.build_programs:
+            raise ConanInvalidConfiguration(f"{self.ref} programs require build_compression=True")
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
@@ -55,6 +75,16 @@ class ZstdConan(ConanFile):
         tc.variables["ZSTD_BUILD_STATIC"] = not self.options.shared or self.options.build_programs
         tc.variables["ZSTD_BUILD_SHARED"] = self.options.shared
         tc.variables["ZSTD_MULTITHREAD_SUPPORT"] = self.options.threading
+        if self.options.legacy_support.value is not None:
+            tc.cache_variables["ZSTD_LEGACY_SUPPORT"] = int(self.options.legacy_support) != 0
+            if int(self.options.legacy_support) != 0:
+                tc.cache_variables["ZSTD_LEGACY_LEVEL"] = str(self.options.legacy_support)
+        if "build_compression" in self.options:
+            tc.cache_variables["ZSTD_BUILD_COMPRESSION"] = self.options.build_compression
+            # The dictionary builder is built on top of the compressor
+            tc.cache_variables["ZSTD_BUILD_DICTBUILDER"] = self.options.build_compression
+        if not self.options.get_safe("with_asm", True):
+            tc.preprocessor_definitions["ZSTD_DISABLE_ASM"] = 1
         if Version(self.version) < "1.5.6":
             tc.cache_variables["CMAKE_POLICY_VERSION_MINIMUM"] = "3.5" # CMake 4 support
         tc.generate()
@@ -1,12 +1,15 @@
 #include <stdio.h>
 #include <stdlib.h>
-#include <string.h>
 #include <zstd.h>
 
 int main() {
-    const char* originalData = "Sample text";
-    size_t compressedSize = ZSTD_compressBound(strlen(originalData) + 1);
-    printf("%zu\n", compressedSize);
+    /* Only use the decompressor, which is built in every configuration */
+    ZSTD_DCtx* dctx = ZSTD_createDCtx();
+    if (dctx == NULL) {
+        return EXIT_FAILURE;
+    }
+    printf("zstd %s, %zu\n", ZSTD_versionString(), ZSTD_DStreamOutSize());
+    ZSTD_freeDCtx(dctx);
 
-    return 0;
+    return EXIT_SUCCESS;
 }